@@ -0,0 +1,210 @@
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+
+from clourd_resource import CloudResourceAllocation
+from experiments import derive_seed
+from generators import generate_cost_matrix, generate_processing_times
+
+# Siatka rozmiarów instancji (liczba zadań, liczba zasobów)
+GRID = [(5, 5), (20, 20), (50, 50), (100, 100)]
+# Największa liczba przydziałów, dla której brute force przegląda wszystkie kombinacje
+PRODUCT_LIMIT = 10 ** 5
+# Najmniejszy łączny czas jednego pomiaru (s); szybkie fazy wykonywane są wielokrotnie w jednym pomiarze
+MIN_SAMPLE_TIME = 0.05
+# Największa liczba wykonań w pomiarze (kopie instancji przygotowywane są przed pomiarem)
+MAX_NUMBER = 10000
+# Rozmiar pracy wzorcowej mierzonej przed każdym pomiarem (kilka milisekund)
+REFERENCE_SIZE = 100000
+# Największa liczba zadań, dla której mierzona jest faza (przeszukiwanie z pojemnościami rośnie wykładniczo)
+MAX_TASKS = {'brute_force_optimization': 20}
+
+
+def _build_system(num_tasks, num_resources, initialize):
+    seed = derive_seed(0, ('benchmark', num_tasks, num_resources))
+    random.seed(seed)
+    cost_matrix = generate_cost_matrix(num_tasks, num_resources)
+    processing_times = generate_processing_times(num_tasks)
+    system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    if initialize:
+        system.random_initialization()
+    return system
+
+
+def _copy_system(system):
+    # Nowa alokacja na tej samej macierzy kosztów z kopią przypisania - koszt O(T) poza mierzonym czasem
+    copy = CloudResourceAllocation(system.num_tasks, system.num_resources, system.cost_matrix, system.processing_times)
+    copy.set_assignment(array('i', system.assignment))
+    return copy
+
+
+def _brute_force(system):
+    # Pojemność 1 na zasobie: bez ograniczeń rozwiązanie zachłanne jest optymalne już w korzeniu drzewa,
+    # więc pomiar nie obejmowałby przeszukiwania
+    capacities = [1] * system.num_resources
+    if system.num_resources ** system.num_tasks <= PRODUCT_LIMIT:
+        system.brute_force_optimization(capacities=capacities)
+    else:
+        system.brute_force_optimization(method='branch_and_bound', capacities=capacities)
+
+
+# Faza: (czy przygotować losowe przypisanie, mierzona operacja)
+PHASES = {
+    'initial_optimization': (False, lambda system: system.initial_optimization()),
+    'random_initialization': (False, lambda system: system.random_initialization()),
+    'minimize_splr': (True, lambda system: system.minimize_splr()),
+    'minimize_gelr': (True, lambda system: system.minimize_gelr()),
+    'evolutionary_optimization': (True, lambda system: system.evolutionary_optimization()),
+    'brute_force_optimization': (False, _brute_force),
+    'calculate_total_cost': (True, lambda system: system.calculate_total_cost()),
+}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _timed(operation, arguments):
+    """
+    Czas (s) wykonania operation dla każdego z arguments; jak w timeit odśmiecanie jest wyłączone
+    na czas pomiaru, aby nie dodawało przypadkowych przerw.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for argument in arguments:
+            operation(argument)
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _reference_workload(size):
+    # Stała praca wzorcowa mierzona obok każdego pomiaru - jej czas śledzi bieżącą szybkość maszyny
+    total = 0
+    for value in range(size):
+        total += value * value
+    return total
+
+
+def measure(phase, num_tasks, num_resources, repeats):
+    """
+    Mierzy fazę na instancji o podanym rozmiarze.
+
+    Każdy z repeats pomiarów wykonuje fazę number razy (jak timeit.Timer.autorange, number dobierane tak,
+    aby pomiar trwał co najmniej MIN_SAMPLE_TIME) na osobnych kopiach instancji przygotowanych przed
+    pomiarem i dzieli łączny czas przez number. Przed każdym pomiarem mierzona jest praca wzorcowa
+    (_reference_workload), której mediana pozwala w find_regressions odróżnić regresję od chwilowego
+    spowolnienia całej maszyny.
+
+    Zwraca:
+    dict: Mediana i 95. percentyl czasu jednego wykonania (s), liczba wykonań w pomiarze, mediana czasu
+          pracy wzorcowej (s) oraz szczytowe zużycie pamięci (bajty) zmierzone w osobnym przebiegu,
+          aby śledzenie alokacji nie zaburzało pomiaru czasu.
+    """
+    initialize, operation = PHASES[phase]
+    template = _build_system(num_tasks, num_resources, initialize)
+    system = _copy_system(template)
+    start = time.perf_counter()
+    operation(system)
+    single = time.perf_counter() - start
+    number = min(MAX_NUMBER, max(1, math.ceil(MIN_SAMPLE_TIME / max(single, 1e-9))))
+
+    times = []
+    references = []
+    for _ in range(repeats):
+        references.append(_timed(_reference_workload, [REFERENCE_SIZE]))
+        systems = [_copy_system(template) for _ in range(number)]
+        times.append(_timed(operation, systems) / number)
+
+    system = _copy_system(template)
+    tracemalloc.start()
+    try:
+        operation(system)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'median': statistics.median(times), 'p95': _percentile(times, 0.95), 'number': number,
+            'reference': statistics.median(references), 'peak_memory': peak_memory}
+
+
+def run_benchmarks(grid=GRID, phases=None, repeats=5):
+    """
+    Zwraca wyniki w postaci {faza: {"TxR": {"median", "p95", "number", "reference", "peak_memory"}}}.
+    """
+    results = {}
+    for phase in phases or PHASES:
+        results[phase] = {}
+        for num_tasks, num_resources in grid:
+            if num_tasks > MAX_TASKS.get(phase, num_tasks):
+                continue
+            results[phase][f"{num_tasks}x{num_resources}"] = measure(phase, num_tasks, num_resources, repeats)
+    return results
+
+
+def find_regressions(results, baseline, threshold, min_difference=1e-3):
+    """
+    Zwraca listę (faza, rozmiar, mediana bazowa, mediana bieżąca) dla pomiarów, których mediana
+    przekracza medianę bazową o więcej niż threshold (ułamek, np. 0.2 = 20%) i jednocześnie
+    o więcej niż min_difference sekund, aby wahania krótkich faz nie były zgłaszane jako regresje.
+    Jeśli oba wyniki zawierają czas pracy wzorcowej, bieżąca mediana jest najpierw przeliczana
+    na szybkość maszyny z pomiaru bazowego.
+    """
+    regressions = []
+    for phase, sizes in results.items():
+        for size, current in sizes.items():
+            reference = baseline.get(phase, {}).get(size)
+            if reference is None:
+                continue
+            median = current['median']
+            if current.get('reference') and reference.get('reference'):
+                median *= reference['reference'] / current['reference']
+            if median > reference['median'] * (1 + threshold) and median - reference['median'] > min_difference:
+                regressions.append((phase, size, reference['median'], median))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pomiar wydajności faz optymalizacji")
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help="Plik z wynikami bazowymi")
+    parser.add_argument('--output', default='benchmark_results.json', help="Plik z bieżącymi wynikami")
+    parser.add_argument('--repeats', type=int, default=5, help="Liczba pomiarów każdej fazy")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Dopuszczalny wzrost mediany (ułamek)")
+    parser.add_argument('--min-difference', type=float, default=1e-3,
+                        help="Najmniejszy wzrost mediany (s) zgłaszany jako regresja")
+    parser.add_argument('--phase', action='append', choices=list(PHASES), help="Mierzona faza (domyślnie wszystkie)")
+    parser.add_argument('--update-baseline', action='store_true', help="Zapisz wyniki jako nowe wyniki bazowe")
+    args = parser.parse_args()
+
+    results = run_benchmarks(phases=args.phase, repeats=args.repeats)
+    for phase, sizes in results.items():
+        for size, result in sizes.items():
+            print(f"{phase:28} {size:>9} mediana {result['median']:.6f} s  p95 {result['p95']:.6f} s  "
+                  f"pamięć {result['peak_memory'] / 1024:.1f} KiB")
+    with open(args.output, mode='w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, mode='w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"Zapisano wyniki bazowe do '{args.baseline}'")
+    else:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.threshold, args.min_difference)
+        for phase, size, reference, current in regressions:
+            print(f"REGRESJA {phase} {size}: {reference:.6f} s -> {current:.6f} s")
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,71 @@
+import numpy as np
+import pulp
+
+from sparse import SparseCostMatrix
+
+
+def row_minimum_bound(cost_matrix, processing_times):
+    """
+    Dolne ograniczenie kosztu całkowitego: suma najmniejszych kosztów processing_times[i] * cost_matrix[i][j]
+    każdego zadania. Bez ograniczeń pojemności jest równe kosztowi optymalnemu, a przy ograniczeniach
+    pozostaje poprawnym (słabszym) ograniczeniem.
+
+    Czasy przetwarzania są nieujemne, więc wystarcza minimum każdego wiersza macierzy kosztów pomnożone
+    przez czas zadania - bez budowania macierzy kosztów ważonych.
+    """
+    times = np.asarray(processing_times, dtype=float)
+    if not len(times):
+        return 0.0
+    if isinstance(cost_matrix, SparseCostMatrix):
+        if np.any(np.diff(cost_matrix.indptr) == 0):
+            return float('inf')  # Zadanie bez dopuszczalnego zasobu
+        minima = np.minimum.reduceat(cost_matrix.data, cost_matrix.indptr[:-1])
+    elif isinstance(cost_matrix, np.ndarray):
+        minima = cost_matrix.min(axis=1)
+    else:
+        minima = np.fromiter((min(row) for row in cost_matrix), dtype=float, count=len(times))
+    return float(np.dot(minima, times))
+
+
+def lp_bound(cost_matrix, processing_times, capacities):
+    """
+    Dolne ograniczenie z relaksacji liniowej przydziału z pojemnościami zasobów (model PuLP ze zmiennymi ciągłymi).
+    Macierz ograniczeń przydziału jest całkowitoliczbowo unimodularna, więc przy całkowitych pojemnościach
+    ograniczenie równe jest kosztowi optymalnemu - i kosztuje tyle co rozwiązanie dokładne, dlatego jest
+    używane tylko na żądanie. Zwraca inf, gdy pojemności nie pozwalają przypisać wszystkich zadań.
+    """
+    num_tasks = len(processing_times)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        pairs = [(i, j, cost) for i in range(num_tasks) for j, cost in cost_matrix.row_items(i)]
+    else:
+        pairs = [(i, j, cost) for i in range(num_tasks) for j, cost in enumerate(cost_matrix[i])]
+    model = pulp.LpProblem("Lower_Bound", pulp.LpMinimize)
+    allocation_vars = pulp.LpVariable.dicts("Allocation", range(len(pairs)), lowBound=0, upBound=1)
+    model += pulp.lpSum(float(processing_times[i]) * float(cost) * allocation_vars[k]
+                        for k, (i, _, cost) in enumerate(pairs))
+    by_task = [[] for _ in range(num_tasks)]
+    by_resource = {}
+    for k, (i, j, _) in enumerate(pairs):
+        by_task[i].append(allocation_vars[k])
+        by_resource.setdefault(j, []).append(allocation_vars[k])
+    for variables in by_task:
+        model += pulp.lpSum(variables) == 1
+    for j, variables in by_resource.items():
+        model += pulp.lpSum(variables) <= capacities[j]
+    model.solve(pulp.PULP_CBC_CMD(msg=False))
+    if pulp.LpStatus[model.status] != 'Optimal':
+        return float('inf')
+    return float(pulp.value(model.objective) or 0.0)
+
+
+def optimality_gap(cost, bound, rounding=1e-9):
+    """
+    Względna luka optymalności (cost - bound) / bound; 0, gdy koszt osiągnął ograniczenie
+    (z dokładnością rounding względną, bo koszt i ograniczenie sumowane są w różnej kolejności).
+    Dla ograniczenia inf (instancja bez dopuszczalnego przydziału) zwraca inf.
+    """
+    if bound == float('inf'):
+        return float('inf')
+    if cost <= bound + rounding * abs(bound):
+        return 0.0
+    return (cost - bound) / abs(bound) if bound else float('inf')
@@ -1,70 +1,447 @@
 import pulp
 import random
 import itertools
+import hashlib
+import logging
+import time
+from array import array
+
+from bounds import lp_bound, optimality_gap, row_minimum_bound
+from cost_state import GlobalCostState, LoadState, UtilityState
+from instance import Solution
+from instance_format import load_instance, load_solution, save_instance, save_solution
+from instrumentation import NULL_INSTRUMENTATION, timed_phase
+from nash import best_response_dynamics, improving_deviations, utility_at, utility_gain_matrix, utility_matrix
+from solution_cache import instance_digest, instance_profile
+from solvers import branch_and_bound, hungarian
+from sparse import SparseCostMatrix, eligible_resources
+
+logger = logging.getLogger(__name__)
 
 class CloudResourceAllocation:
-    def __init__(self, num_tasks, num_resources, cost_matrix, processing_times):
+    def __init__(self, num_tasks, num_resources, cost_matrix, processing_times, instrumentation=None,
+                 record_gaps=False):
         self.num_tasks = num_tasks
         self.num_resources = num_resources
+        # cost_matrix i processing_times mogą być listami lub tablicami NumPy (np. wycinkami wyników
+        # generate_cost_tensor / generate_processing_times_batch) - są używane bez kopiowania.
+        # cost_matrix może być też macierzą rzadką SparseCostMatrix - wtedy rozważane są tylko dopuszczalne pary
         self.cost_matrix = cost_matrix
+        self.sparse = isinstance(cost_matrix, SparseCostMatrix)
         self.processing_times = processing_times  # Czas przetwarzania dla każdego zadania
-        self.allocation_matrix = [[0 for _ in range(num_resources)] for _ in range(num_tasks)]
+        # Wektor przypisań: assignment[i] to indeks zasobu zadania i, -1 oznacza brak przypisania
+        self.assignment = array('i', [-1] * num_tasks)
+        self._allocation_view = None
+        self._cost_state = None
+        self._utility_state = None
+        self._load_state = None
+        self._utility_matrix = None
+        self._instance_digest = None
+        self._instance_profile = None
+        # Współdzielona niezmienna instancja (instance.Instance), jeśli obiekt utworzono przez from_instance
+        self.instance = None
+        # Najlepsze rozwiązanie odwiedzone przez optymalizację ewolucyjną
+        self.best_assignment = None
+        self.best_cost = None
+        self.evolutionary_status = None
+        # Dolne ograniczenia kosztu i luka optymalności zgłoszona przez każdą metodę - wyznaczana tylko
+        # przy record_gaps lub podanej tolerance, bo wymaga przejścia po całej macierzy kosztów
+        self.record_gaps = record_gaps
+        self._lower_bounds = {}
+        self.gaps = {}
+        # Pomiary czasu faz i liczniki (instrumentation.Instrumentation); domyślnie wyłączone
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+
+    @classmethod
+    def from_instance(cls, instance, solution=None, **kwargs):
+        """
+        Tworzy alokację na współdzielonej instancji (instance.Instance) bez kopiowania kosztów.
+        Z instancji używane są: dwa najtańsze zasoby zadań (GlobalCostState), koszty ważone przy przeliczaniu
+        całego przypisania (calculate_total_cost, UtilityState, LoadState) i macierz użyteczności.
+        Przypisanie (O(T)) przejmowane jest z solution, jeśli je podano.
+        """
+        system = cls(instance.num_tasks, instance.num_resources, instance.cost_matrix, instance.processing_times,
+                     **kwargs)
+        system.instance = instance
+        if solution is not None:
+            system.set_assignment(solution.assignment)
+        return system
+
+    def solution(self):
+        """
+        Zwraca bieżące przypisanie jako lekkie rozwiązanie (instance.Solution) współdzielonej instancji.
+        """
+        if self.instance is None:
+            raise ValueError("Alokacja nie została utworzona przez from_instance")
+        return Solution(self.instance, array('i', self.assignment))
+
+    @classmethod
+    def from_instance_file(cls, filename, **kwargs):
+        """
+        Tworzy alokację na instancji z pliku binarnego (instance_format) otwartej przez numpy.memmap bez kopiowania.
+        """
+        num_tasks, num_resources, cost_matrix, processing_times = load_instance(filename)
+        return cls(num_tasks, num_resources, cost_matrix, processing_times, **kwargs)
+
+    def save_instance(self, filename):
+        save_instance(filename, self.cost_matrix, self.processing_times)
+
+    def save_solution(self, filename):
+        save_solution(filename, self.assignment, self.calculate_total_cost())
+
+    def load_solution(self, filename):
+        """
+        Wczytuje przypisanie zapisane przez save_solution i zwraca zapisany koszt całkowity.
+        """
+        assignment, total_cost = load_solution(filename)
+        if len(assignment) != self.num_tasks:
+            raise ValueError("Liczba zadań w rozwiązaniu nie odpowiada instancji")
+        self.set_assignment(assignment.tobytes())
+        return total_cost
+
+    def solve_cached(self, cache, phase, warm_start=True, **params):
+        """
+        Wywołuje metodę optymalizacji phase(**params) przez pamięć podręczną rozwiązań (SolutionCache).
+
+        Przy trafieniu przypisanie jest odtwarzane bez uruchamiania solvera. Klucz metod zależnych od przypisania
+        początkowego (wszystkich poza initial_optimization i brute_force_optimization) zawiera bieżące przypisanie.
+        Przy braku trafienia i warm_start przypisanie najbliższej zapamiętanej instancji staje się punktem startowym
+        metody, a dla brute_force_optimization z method='branch_and_bound' początkowym ograniczeniem (initial).
+        Klucz wyznaczany jest wtedy ponownie dla faktycznego startu, więc wynik pod danym kluczem nie zależy
+        od wcześniejszej zawartości pamięci podręcznej.
+
+        Zwraca:
+        Koszt całkowity rozwiązania.
+        """
+        if self._instance_digest is None:
+            # Instancja nie zmienia się w trakcie życia obiektu - skrót liczony jest raz
+            self._instance_digest = instance_digest(self.cost_matrix, self.processing_times)
+        exact = phase in ('initial_optimization', 'brute_force_optimization')
+        key = cache.key(self._instance_digest, phase, params, None if exact else self.assignment)
+        entry = cache.get(key)
+        if entry is not None:
+            self.set_assignment(entry[0])
+            return entry[1]
+
+        # Szkic instancji potrzebny jest tylko do rozgrzanego startu - bez warm_start wynik nie jest zgłaszany
+        # do wyszukiwania bliskich instancji
+        weights = group = warm = None
+        if warm_start:
+            if self._instance_profile is None:
+                self._instance_profile = instance_profile(self.cost_matrix, self.processing_times)
+            structure, weights = self._instance_profile
+            group = (structure, phase, repr(sorted(params.items())))
+            # Metoda 'product' przeglądu zupełnego nie korzysta z initial, a initial_optimization ze startu
+            if not exact or params.get('method') == 'branch_and_bound':
+                warm = cache.nearest(weights, group)
+        if warm is not None:
+            if exact:
+                params = dict(params, initial=list(warm))
+                key = cache.key(self._instance_digest, phase, params)
+            else:
+                self.set_assignment(warm)
+                key = cache.key(self._instance_digest, phase, params, self.assignment)
+            entry = cache.get(key)
+            if entry is not None:
+                self.set_assignment(entry[0])
+                return entry[1]
+        getattr(self, phase)(**params)
+        total_cost = self.calculate_total_cost()
+        cache.put(key, self.assignment, total_cost, weights, group)
+        return total_cost
+
+    @property
+    def allocation_matrix(self):
+        """
+        Macierz alokacji budowana leniwie z wektora przypisań.
+        Widok służy tylko do odczytu - zmiany przypisań należy wykonywać przez perform_reallocation.
+        """
+        if self._allocation_view is None:
+            matrix = [[0 for _ in range(self.num_resources)] for _ in range(self.num_tasks)]
+            for task, resource in enumerate(self.assignment):
+                if resource >= 0:
+                    matrix[task][resource] = 1
+            self._allocation_view = matrix
+        return self._allocation_view
+
+    @allocation_matrix.setter
+    def allocation_matrix(self, matrix):
+        assignment = []
+        for row in matrix:
+            resource = -1
+            for j, value in enumerate(row):
+                if value == 1:
+                    resource = j
+                    break
+            assignment.append(resource)
+        self.set_assignment(assignment)
+
+    def set_assignment(self, assignment):
+        """
+        Zastępuje całe przypisanie zadań do zasobów (indeks zasobu lub -1 dla każdego zadania,
+        ewentualnie surowe bajty wektora int32).
+        """
+        self.assignment = array('i', assignment)
+        self._invalidate_assignment()
+
+    def _invalidate_assignment(self):
+        """
+        Unieważnia widoki i przelicza stany zależne od całego wektora przypisań.
+        """
+        self._allocation_view = None
+        if self._cost_state is not None:
+            self._cost_state.reset(self.assignment)
+        if self._utility_state is not None:
+            self._utility_state.reset(self.assignment)
+        if self._load_state is not None:
+            self._load_state.reset(self.assignment)
+
+    def _eligible(self, task):
+        """
+        Zasoby, do których można przypisać zadanie (w trybie gęstym wszystkie).
+        """
+        return eligible_resources(self.cost_matrix, task)
+
+    def _global_cost_state(self):
+        """
+        Zwraca (budując przy pierwszym użyciu) stan kosztu globalnego.
+        """
+        if self._cost_state is None:
+            ranked = (self.instance.best, self.instance.second) if self.instance is not None else None
+            self._cost_state = GlobalCostState(self.cost_matrix, self.assignment, ranked)
+        return self._cost_state
+
+    def _task_utility_state(self):
+        """
+        Zwraca (budując przy pierwszym użyciu) stan użyteczności zadań.
+        """
+        if self._utility_state is None:
+            self._utility_state = UtilityState(self.cost_matrix, self.processing_times, self.assignment,
+                                               self.instance)
+        return self._utility_state
+
+    def _task_load_state(self):
+        """
+        Zwraca (budując przy pierwszym użyciu) stan obciążenia zasobów z indeksem zadań każdego zasobu.
+        """
+        if self._load_state is None:
+            self._load_state = LoadState(self.cost_matrix, self.processing_times, self.num_resources, self.assignment,
+                                         self.instance)
+        return self._load_state
+
+    @timed_phase('initial_optimization')
+    def initial_optimization(self, solver='auto', capacities=None):
+        """
+        Początkowa optymalizacja przydziału zadań do zasobów.
+
+        Parametry:
+        solver (str): 'hungarian' - metoda węgierska w procesie, 'pulp' - model PuLP/CBC,
+                      'auto' - metoda węgierska, jeśli problem jest czystym problemem przydziału, inaczej PuLP.
+        capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie (domyślnie 1).
+
+        Zwraca:
+        Wartość funkcji celu znalezionego rozwiązania.
+
+        Metoda nie przyjmuje tolerance i nie zgłasza luki w gaps: jest jednorazowym dokładnym rozwiązaniem
+        własnej funkcji celu (innej niż koszt całkowity), bez pętli, którą można by przerwać wcześniej.
+        """
+        if solver not in ('auto', 'hungarian', 'pulp'):
+            raise ValueError(f"Nieznany solver: {solver}")
+        if capacities is None:
+            capacities = [1] * self.num_resources
+
+        # Każde zadanie na dokładnie jednym zasobie, każdy zasób z co najwyżej jednym zadaniem
+        pure_assignment = all(c == 1 for c in capacities) and self.num_tasks <= self.num_resources
+        if solver == 'hungarian' and (not pure_assignment or self.sparse):
+            raise ValueError("Metoda węgierska wymaga gęstej macierzy kosztów, pojemności 1 "
+                             "i liczby zadań nie większej niż liczba zasobów")
+        # Dla macierzy rzadkiej model PuLP zawiera tylko zmienne dopuszczalnych par
+        pure_assignment = pure_assignment and not self.sparse
+        if solver == 'hungarian' or (solver == 'auto' and pure_assignment):
+            return self._initial_optimization_hungarian()
+        return self._initial_optimization_pulp(capacities)
+
+    def _objective_coefficient(self, task, resource):
+        """
+        Współczynnik funkcji celu początkowej optymalizacji dla pary zadanie-zasób.
+        """
+        return self.processing_times[task]
+
+    def _objective_coefficients(self):
+        return [[self._objective_coefficient(i, j) for j in range(self.num_resources)] for i in range(self.num_tasks)]
+
+    def _initial_optimization_hungarian(self):
+        coefficients = self._objective_coefficients()
+        assignment = hungarian(coefficients)
+        self.set_assignment(assignment)
+        return sum(coefficients[i][j] for i, j in enumerate(assignment))
+
+    def _initial_optimization_pulp(self, capacities):
+        # Zmienne tylko dla dopuszczalnych par zadanie-zasób (w trybie gęstym dla wszystkich)
+        pairs = [(i, j) for i in range(self.num_tasks) for j in self._eligible(i)]
+        tasks_on_resource = [[] for _ in range(self.num_resources)]
+        for i, j in pairs:
+            tasks_on_resource[j].append(i)
 
-    def initial_optimization(self):
         model = pulp.LpProblem("Initial_Resource_Allocation", pulp.LpMinimize)
-        allocation_vars = pulp.LpVariable.dicts("Allocation",
-                                                ((i, j) for i in range(self.num_tasks)
-                                                 for j in range(self.num_resources)),
-                                                cat='Binary')
+        allocation_vars = pulp.LpVariable.dicts("Allocation", pairs, cat='Binary')
 
         # Funkcja celu: minimalizacja sumy czasów przetwarzania na wszystkich zasobach
-        model += pulp.lpSum([self.processing_times[i] * allocation_vars[i, j]
-                             for i in range(self.num_tasks)
-                             for j in range(self.num_resources)])
+        model += pulp.lpSum([self._objective_coefficient(i, j) * allocation_vars[i, j] for i, j in pairs])
 
         # Ograniczenia jak poprzednio
         for i in range(self.num_tasks):
-            model += pulp.lpSum([allocation_vars[i, j] for j in range(self.num_resources)]) == 1
+            model += pulp.lpSum([allocation_vars[i, j] for j in self._eligible(i)]) == 1
         for j in range(self.num_resources):
-            model += pulp.lpSum([allocation_vars[i, j] for i in range(self.num_tasks)]) <= 1
+            model += pulp.lpSum([allocation_vars[i, j] for i in tasks_on_resource[j]]) <= capacities[j]
 
         model.solve()
 
-        # Aktualizacja macierzy alokacji
-        self.allocation_matrix = [[allocation_vars[i, j].varValue for j in range(self.num_resources)]
-                                  for i in range(self.num_tasks)]
+        # Aktualizacja wektora przypisań
+        assignment = [-1] * self.num_tasks
+        for i, j in pairs:
+            if assignment[i] == -1 and (allocation_vars[i, j].varValue or 0) > 0.5:
+                assignment[i] = j
+        self.set_assignment(assignment)
+        return pulp.value(model.objective)
 
+    @timed_phase('random_initialization')
     def random_initialization(self):
+        """
+        Przypisuje każde zadanie do losowego zasobu (w trybie rzadkim - do losowego zasobu dopuszczalnego).
+        Zadanie bez dopuszczalnych zasobów pozostaje nieprzypisane (-1).
+        """
+        unassigned = 0
         for i in range(self.num_tasks):
             # Losowe przypisanie zadania do zasobu
-            resource = random.randint(0, self.num_resources - 1)
-            self.allocation_matrix[i][resource] = 1
+            if self.sparse:
+                eligible = self._eligible(i)
+                if not eligible:
+                    resource = -1
+                    unassigned += 1
+                else:
+                    resource = random.choice(eligible)
+            else:
+                resource = random.randint(0, self.num_resources - 1)
+            self.assignment[i] = resource
+        if unassigned:
+            logger.warning("Zadania bez dopuszczalnych zasobów pozostawiono nieprzypisane: %d", unassigned)
+        self._invalidate_assignment()
+
+    @timed_phase('evolutionary_optimization')
+    def evolutionary_optimization(self, time_limit=None, max_evaluations=None, tolerance=None):
+        """
+        Optymalizacja ewolucyjna.
+
+        Parametry:
+        time_limit (float | None): Limit czasu działania w sekundach.
+        max_evaluations (int | None): Limit liczby ocenionych par zadanie-zasób.
+        tolerance (float | None): Dopuszczalna luka optymalności względem dolnego ograniczenia (lower_bound);
+                                  przy podanej optymalizacja kończy się, gdy luka ją osiągnie.
 
-    def evolutionary_optimization(self):
+        Optymalizacja kończy się, gdy pełny przebieg nie wprowadził zmian, gdy przypisanie po przebiegu
+        powtarza stan odwiedzony wcześniej (cykl realokacji), po wyczerpaniu limitu lub po osiągnięciu
+        dopuszczalnej luki (status 'bound'). Najlepsze odwiedzone rozwiązanie jest dostępne w każdej chwili
+        przez best_solution(), a przy podanym limicie jest przywracane na koniec. Powód zakończenia zapisywany jest w evolutionary_status.
+        """
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        current_cost = self.calculate_total_cost()
+        self.best_cost = current_cost
+        self.best_assignment = array('i', self.assignment)
+        visited = {self._assignment_digest()}
+        evaluations = 0
+        status = 'converged'
+        # Koszt, przy którym luka względem dolnego ograniczenia nie przekracza tolerance
+        target = self._gap_target(tolerance)
+        if target is not None and optimality_gap(current_cost, target) == 0:
+            status = 'bound'
+
+        # Liczniki zbierane lokalnie i doliczane raz po zakończeniu fazy (_flush_counts)
+        cost_evaluations = reallocations = passes = 0
         i = 0  # Rozpocznij od pierwszego zadania (indeks 0 w indeksacji od zera)
-        flag = True
+        flag = self.num_tasks > 0 and status == 'converged'
         while flag:  # Kontynuuj, dopóki nie zostaną dokonane żadne zmiany w pełnym przebiegu
             flag = False  # Zresetuj flagę dla bieżącego przebiegu
             while True:
                 ms = self.obtain_multiplexing_resource_vector(i)  # Pobierz wektor zasobów dla zadania
                 for j in ms:
-                    q = self.MinGlobal(i, j)  # Znajdź nową alokację zasobów
+                    if max_evaluations is not None and evaluations >= max_evaluations:
+                        status = 'evaluations'
+                        break
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        status = 'deadline'
+                        break
+                    evaluations += 1
+                    q, counted = self._min_global(i, j)  # Znajdź nową alokację zasobów
+                    cost_evaluations += counted
                     if q != -1:  # Jeśli nowa alokacja jest możliwa
-                        p = self.MinSingle(i, j)  # Znajdź optymalną pojedynczą alokację
+                        p, counted = self._min_single_cost(i, j)  # Znajdź optymalną pojedynczą alokację
+                        cost_evaluations += counted
                         if p != -1 and p != q:  # Jeśli znaleziono lepszą alokację i jest ona różna od obecnej
-                            self.execute_reallocation(i, j, p)  # Dokonaj realokacji
+                            old = self.assignment[i]
+                            if old >= 0 and old != p:  # Dokonaj realokacji (jak execute_reallocation)
+                                self._move(i, old, p)
+                                reallocations += 1
                             flag = True  # Ustaw flagę na True, ponieważ dokonano zmiany
-                            print(f"Zadanie {i + 1} - zasób {j} realokacja do {p} wykonana.")
+                            logger.debug("Zadanie %d - zasób %d realokacja do %d wykonana.", i + 1, j, p)
+                            current_cost += self.processing_times[i] * (
+                                self.cost_matrix[i][p] - (self.cost_matrix[i][old] if old >= 0 else 0))
+                            if current_cost < self.best_cost:
+                                self.best_cost = current_cost
+                                self.best_assignment = array('i', self.assignment)
+                                if target is not None and optimality_gap(current_cost, target) == 0:
+                                    status = 'bound'
+                                    break
+                if status != 'converged':
+                    flag = False
+                    break  # Limit wyczerpany - przerwij optymalizację
 
                 if i == self.num_tasks - 1:  # Sprawdź, czy osiągnięto ostatnie zadanie
+                    passes += 1
                     if not flag:
                         break  # Żadne realokacje nie zostały wykonane w tym przebiegu, więc przerwij pętlę
-                    else:
-                        i = 0  # Zresetuj indeks zadania na 0, aby rozpocząć nowy przebieg
+                    digest = self._assignment_digest()
+                    if digest in visited:
+                        status = 'cycle'  # Przebieg wrócił do odwiedzonego już przypisania
+                        flag = False
+                        break
+                    visited.add(digest)
+                    i = 0  # Zresetuj indeks zadania na 0, aby rozpocząć nowy przebieg
+                    flag = False
                 else:
                     i += 1  # Przejdź do następnego zadania
 
-        print("Optymalizacja ewolucyjna zakończona.")
+        self._flush_counts(cost_evaluations=cost_evaluations, reallocations=reallocations, passes=passes)
+        self.evolutionary_status = status
+        if (time_limit is not None or max_evaluations is not None) and self.best_cost < current_cost:
+            self.set_assignment(self.best_assignment)
+        self._record_gap('evolutionary_optimization', tolerance)
+        logger.info("Optymalizacja ewolucyjna zakończona.")
+
+    def _flush_counts(self, **counts):
+        """
+        Dolicza liczniki zebrane lokalnie w pętli fazy - wyłączone pomiary sprawdzane są raz na fazę,
+        a nie przy każdej ocenie.
+        """
+        if self.instrumentation.enabled:
+            for name, amount in counts.items():
+                if amount:
+                    self.instrumentation.count(name, amount)
+
+    def _assignment_digest(self):
+        """
+        Skrót wektora przypisań służący do wykrywania powtórzonych stanów.
+        """
+        return hashlib.blake2b(self.assignment.tobytes(), digest_size=16).digest()
+
+    def best_solution(self):
+        """
+        Zwraca najlepsze rozwiązanie odwiedzone przez optymalizację ewolucyjną (przypisanie i koszt całkowity).
+        Przed pierwszym uruchomieniem zwraca bieżące przypisanie.
+        """
+        if self.best_assignment is None:
+            return list(self.assignment), self.calculate_total_cost()
+        return list(self.best_assignment), self.best_cost
 
     def tij(self, resource_j):
         # Ta funkcja powinna zwracać pewną metrykę związaną z zadaniem i zasobem j
@@ -74,37 +451,49 @@ class CloudResourceAllocation:
     def obtain_multiplexing_resource_vector(self, task_i):
         # Zakładając, że każde zadanie może być przypisane tylko do jednego zasobu na raz
         current_resource = self.get_current_resource(task_i)
-        return [j for j in range(self.num_resources) if j != current_resource]
+        return [j for j in self._eligible(task_i) if j != current_resource]
 
     def MinGlobal(self, task_i, resource_j):
-        # Znajdź zasób minimalizujący globalny koszt dla zadania task_i, wykluczając bieżący zasób resource_j
-        min_cost = float('inf')
-        min_resource_index = -1
-        for r in range(self.num_resources):
-            if r != resource_j:
-                cost = self.calculate_global_cost(task_i, r)  # Należy zdefiniować tę metodę na podstawie problemu
-                if cost < min_cost:
-                    min_cost = cost
-                    min_resource_index = r
-        return min_resource_index if min_cost < self.calculate_global_cost(task_i, resource_j) else -1
+        min_resource_index, evaluations = self._min_global(task_i, resource_j)
+        self._flush_counts(cost_evaluations=evaluations)
+        return min_resource_index
+
+    def _min_global(self, task_i, resource_j):
+        # Znajdź zasób minimalizujący globalny koszt dla zadania task_i, wykluczając bieżący zasób resource_j.
+        # Koszt globalny różni się między zasobami tylko składnikiem cost_matrix[task_i][r],
+        # więc szukany zasób to najtańszy zasób wiersza z pominięciem resource_j.
+        # Zwraca zasób (-1, jeśli brak poprawy) i liczbę obliczeń kosztu.
+        state = self._global_cost_state()
+        min_resource_index = state.best_excluding(task_i, resource_j)
+        if min_resource_index == -1:
+            return -1, 0
+        current_resource = self.assignment[task_i]
+        min_cost = state.cost_if_moved(task_i, current_resource, min_resource_index)
+        better = min_cost < state.cost_if_moved(task_i, current_resource, resource_j)
+        return (min_resource_index if better else -1), 2
 
     def MinSingle(self, task_i, resource_j):
-        # Znajdź zasób minimalizujący pojedynczy koszt zadania task_i, wykluczając bieżący zasób resource_j
-        min_cost = float('inf')
-        min_resource_index = -1
-        for r in range(self.num_resources):
-            if r != resource_j:
-                cost = self.calculate_single_task_cost(task_i, r)  # Należy zdefiniować tę metodę na podstawie problemu
-                if cost < min_cost:
-                    min_cost = cost
-                    min_resource_index = r
-        return min_resource_index if min_cost < self.calculate_single_task_cost(task_i, resource_j) else -1
+        min_resource_index, evaluations = self._min_single_cost(task_i, resource_j)
+        self._flush_counts(cost_evaluations=evaluations)
+        return min_resource_index
+
+    def _min_single_cost(self, task_i, resource_j):
+        # Znajdź zasób minimalizujący pojedynczy koszt zadania task_i, wykluczając bieżący zasób resource_j.
+        # Przy dodatnim czasie przetwarzania kolejność zasobów jest taka sama jak w wierszu cost_matrix.
+        # Zwraca zasób (-1, jeśli brak poprawy) i liczbę obliczeń kosztu.
+        min_resource_index = self._global_cost_state().best_excluding(task_i, resource_j)
+        if min_resource_index == -1:
+            return -1, 0
+        time_i = self.processing_times[task_i]
+        row = self.cost_matrix[task_i]
+        return (min_resource_index if time_i * row[min_resource_index] < time_i * row[resource_j] else -1), 2
 
     def calculate_single_task_cost(self, task_i, resource_j):
         """
         Oblicz koszt przypisania zadania task_i do zasobu resource_j.
         Przykład używa prostego modelu kosztów opartego na czasach przetwarzania i macierzy kosztów.
         """
+        self.instrumentation.count('cost_evaluations')
         # Zakładamy, że processing_times to lista, gdzie processing_times[i] to czas przetwarzania zadania i
         # oraz cost_matrix to macierz, gdzie cost_matrix[i][j] to czynnik kosztu przypisania zadania i do zasobu j
         task_cost = self.processing_times[task_i] * self.cost_matrix[task_i][resource_j]
@@ -119,19 +508,9 @@ class CloudResourceAllocation:
         if task_i < 0 or task_i >= self.num_tasks or resource_j < 0 or resource_j >= self.num_resources:
             raise ValueError("Indeks task_i lub resource_j poza zakresem")
 
-        current_global_cost = 0
-        for t in range(self.num_tasks):
-            if t != task_i:
-                current_resource = self.get_current_resource(t)
-                if current_resource is not None:
-                    current_global_cost += self.cost_matrix[t][current_resource]
-                else:
-                    pass
-
-        # Dodaj koszt przypisania zadania task_i do zasobu resource_j
-        new_global_cost = current_global_cost + self.cost_matrix[task_i][resource_j]
-
-        return new_global_cost
+        self.instrumentation.count('cost_evaluations')
+        # Bieżąca suma kosztów bez zadania task_i powiększona o koszt przypisania go do zasobu resource_j
+        return self._global_cost_state().cost_if_moved(task_i, self.assignment[task_i], resource_j)
 
     def execute_reallocation(self, task_i, resource_j, resource_p):
         """
@@ -157,24 +536,47 @@ class CloudResourceAllocation:
         Realokuje zadanie (task_index) z obecnego zasobu (old_resource_index)
         do nowego zasobu (new_resource_index).
         """
-        # Usunięcie zadania z obecnego zasobu
-        self.allocation_matrix[task_index][old_resource_index] = 0
-        # Przypisanie zadania do nowego zasobu
-        self.allocation_matrix[task_index][new_resource_index] = 1
+        self.instrumentation.count('reallocations')
+        self._move(task_index, old_resource_index, new_resource_index)
+
+    def _move(self, task_index, old_resource_index, new_resource_index):
+        """
+        Realokacja bez liczników - używana w pętlach faz, które doliczają liczniki raz na koniec.
+        """
+        # Przypisanie zadania do nowego zasobu (poprzedni zasób zostaje zwolniony)
+        current_resource = self.assignment[task_index]
+        self.assignment[task_index] = new_resource_index
+        self._allocation_view = None
+        if self._cost_state is not None:
+            self._cost_state.move(task_index, current_resource, new_resource_index)
+        if self._utility_state is not None:
+            self._utility_state.move(task_index, new_resource_index)
+        if self._load_state is not None:
+            self._load_state.move(task_index, current_resource, new_resource_index)
 
-    def minimize_splr(self):
+    @timed_phase('minimize_splr')
+    def minimize_splr(self, tolerance=None):
         """
         Algorytm 1: Minimizacja SPELR
+
+        Przy podanej tolerance przebieg kończy się, gdy luka optymalności względem lower_bound ją osiągnie.
         """
+        target = self._gap_target(tolerance)
+        utility_evaluations = reallocations = 0
         for task in range(self.num_tasks):
+            if self._gap_reached(target):
+                break
             min_splr = float('inf')
             best_resource = None
             current_resource = self.get_current_resource(task)  # Pobranie obecnego zasobu dla zadania
+            if current_resource is None:
+                continue  # SPELR zadania bez zasobu jest nieskończony - brak realokacji
 
-            for resource in range(self.num_resources):
+            for resource in self._eligible(task):
                 if resource != current_resource:  # Sprawdzanie, czy zasób jest różny od obecnego
                     # Obliczanie SPELR dla każdej pary zadanie-zasób
-                    splr = self.compute_splr(task, resource)
+                    splr = self._utility(task, current_resource) - self._utility(task, resource)
+                    utility_evaluations += 2
                     # Znajdowanie najlepszego zasobu dla realokacji
                     if splr < min_splr:
                         min_splr = splr
@@ -182,7 +584,10 @@ class CloudResourceAllocation:
 
             # Jeśli znaleziono lepszą realokację, wykonaj ją
             if best_resource is not None and min_splr < 0:
-                self.perform_reallocation(task, current_resource, best_resource)
+                self._move(task, current_resource, best_resource)
+                reallocations += 1
+        self._flush_counts(utility_evaluations=utility_evaluations, reallocations=reallocations)
+        self._record_gap('minimize_splr', tolerance)
 
     def compute_splr(self, task_index, resource_index):
         """
@@ -204,37 +609,53 @@ class CloudResourceAllocation:
         if task_index < 0 or task_index >= self.num_tasks:
             return None  # task_index is out of range
 
-        for j in range(self.num_resources):
-            if self.allocation_matrix[task_index][j] == 1:
-                return j
-        return None
+        resource = self.assignment[task_index]
+        return resource if resource >= 0 else None
 
-    def minimize_gelr(self):
+    @timed_phase('minimize_gelr')
+    def minimize_gelr(self, tolerance=None):
         """
         Algorytm 2: Minimizacja GELR zgodnie z opisem w artykule
+
+        Przy podanej tolerance przebieg kończy się, gdy luka optymalności względem lower_bound ją osiągnie.
         """
+        target = self._gap_target(tolerance)
+        gelr = self._task_utility_state().gelr
+        utility_evaluations = reallocations = 0
         for resource in range(self.num_resources):
+            if self._gap_reached(target):
+                break
             mts = self.get_multiplexing_tasks(resource)
             nsts = []
             for task in mts:
-                q = self.min_single(task, resource)
+                q, evaluations = self._min_single(task, resource)
+                utility_evaluations += evaluations
                 if q != -1:
-                    self.perform_reallocation(task, resource, q)
-                    if self.calculate_utility(task, resource) - self.calculate_utility_after_reallocation(task,
-                                                                                                          resource) < 0:
+                    self._move(task, resource, q)
+                    reallocations += 1
+                    utility_evaluations += 1
+                    if self._utility(task, resource) - self.calculate_utility_after_reallocation(task, resource) < 0:
                         nsts.append(task)
 
             if nsts:
-                min_gelr_task = min(nsts, key=lambda k: self.compute_gelr(k, resource))
-                if self.min_single(min_gelr_task, resource) != -1:
-                    self.perform_reallocation(min_gelr_task, resource, self.min_single(min_gelr_task, resource))
+                min_gelr_task = min(nsts, key=lambda k: gelr(k, resource))
+                utility_evaluations += len(nsts)
+                q, evaluations = self._min_single(min_gelr_task, resource)
+                utility_evaluations += evaluations
+                if q != -1:
+                    self._move(min_gelr_task, resource, q)
+                    reallocations += 1
+        self._flush_counts(utility_evaluations=utility_evaluations, reallocations=reallocations)
+        self._record_gap('minimize_gelr', tolerance)
 
     def compute_gelr(self, task_index, resource_index):
         """
-        Prosta heurystyka obliczająca GELR
+        Prosta heurystyka obliczająca GELR.
+        Różnica całkowitej użyteczności przed i po realokacji sprowadza się do zmiany użyteczności
+        jednego zadania, więc liczona jest w czasie O(1) i nie modyfikuje przypisań.
         """
-        return abs(self.calculate_total_utility() - self.calculate_total_utility_after_reallocation(task_index,
-                                                                                                    resource_index))
+        self.instrumentation.count('utility_evaluations')
+        return self._task_utility_state().gelr(task_index, resource_index)
 
     def get_multiplexing_tasks(self, resource):
         """
@@ -242,11 +663,7 @@ class CloudResourceAllocation:
         W przykładowej implementacji, zadanie jest uważane za multiplexujące,
         jeśli obecnie korzysta z danego zasobu.
         """
-        multiplexing_tasks = []
-        for task in range(self.num_tasks):
-            if self.allocation_matrix[task][resource] == 1:
-                multiplexing_tasks.append(task)
-        return multiplexing_tasks
+        return sorted(self._task_load_state().tasks_on[resource])
 
     def min_single(self, task, resource):
         """
@@ -254,25 +671,34 @@ class CloudResourceAllocation:
         W tej implementacji, sprawdzamy każdy zasób inny niż obecnie przypisany
         i wybieramy ten, który minimalizuje GELR.
         """
+        best_resource, evaluations = self._min_single(task, resource)
+        self._flush_counts(utility_evaluations=evaluations)
+        return best_resource
+
+    def _min_single(self, task, resource):
+        """
+        min_single bez liczników - zwraca zasób i liczbę obliczeń GELR.
+        """
+        gelr = self._task_utility_state().gelr
         min_gelr = float('inf')
         best_resource = -1  # Use -1 to indicate no better resource found
-        for r in range(self.num_resources):
+        evaluations = 0
+        for r in self._eligible(task):
             if r != resource:
-                current_gelr = self.compute_gelr(task, r)
+                current_gelr = gelr(task, r)
+                evaluations += 1
                 if current_gelr < min_gelr:
                     min_gelr = current_gelr
                     best_resource = r
-        return best_resource
+        return best_resource, evaluations
 
-    def find_nash_equilibrium(self):
+    def find_nash_equilibrium(self, tolerance=0.0):
         """
-        Szukanie równowagi Nasha.
+        Sprawdza, czy bieżąca alokacja jest równowagą Nasha, czyli czy nie ma odchyleń poprawiających
+        użyteczność (improving_deviations).
         """
-        for task in range(self.num_tasks):
-            for resource in range(self.num_resources):
-                if self.can_improve_nash(task, resource):
-                    return False
-        return True
+        tasks, _, _ = self.improving_deviations(tolerance)
+        return len(tasks) == 0
 
     def can_improve_nash(self, task_index, resource_index):
         """
@@ -282,20 +708,50 @@ class CloudResourceAllocation:
         if current_resource is None or current_resource == resource_index:
             return False
 
-        # Obliczanie użyteczności przed i po potencjalnej realokacji
-        current_utility = self.calculate_utility(task_index, current_resource)
-        new_utility = self.calculate_utility(task_index, resource_index)
+        # Ten sam zysk co w best_response_gains, liczony dla jednej pary zadanie-zasób
+        utilities = self._utilities()
+        return utility_at(utilities, task_index, resource_index) > utility_at(utilities, task_index, current_resource)
+
+    def _utilities(self):
+        """
+        Zwraca (budując przy pierwszym użyciu) macierz użyteczności wszystkich par zadanie-zasób.
+        """
+        if self._utility_matrix is None:
+            self._utility_matrix = self.instance.utility_matrix() if self.instance is not None \
+                else utility_matrix(self.cost_matrix, self.processing_times)
+        return self._utility_matrix
+
+    def best_response_gains(self):
+        """
+        Macierz zysków użyteczności z jednostronnej zmiany zasobu przez każde zadanie (nash.utility_gain_matrix).
+        """
+        return utility_gain_matrix(self._utilities(), self.assignment)
 
-        # Sprawdzanie, czy nowa użyteczność jest większa niż obecna
-        return new_utility > current_utility
+    def improving_deviations(self, tolerance=0.0):
+        """
+        Zwraca zadania, zasoby docelowe i zyski wszystkich odchyleń poprawiających użyteczność.
+        Brak odchyleń oznacza, że bieżąca alokacja jest równowagą Nasha.
+        """
+        return improving_deviations(self.best_response_gains(), tolerance)
+
+    def best_response_dynamics(self, max_iterations=None, tolerance=0.0):
+        """
+        Przenosi zadania do ich najlepszych odpowiedzi aż do osiągnięcia równowagi lub limitu realokacji.
+        Zwraca liczbę realokacji i informację, czy osiągnięto równowagę.
+        """
+        return best_response_dynamics(self, self._utilities(), max_iterations, tolerance)
 
     def calculate_utility(self, task_index, resource_index):
         """
         Oblicza użyteczność zadania w kontekście alokacji do danego zasobu.
         """
+        self.instrumentation.count('utility_evaluations')
+        return self._utility(task_index, resource_index)
+
+    def _utility(self, task_index, resource_index):
         # Załóżmy, że użyteczność jest odwrotnie proporcjonalna do czasu przetwarzania
         # i jest związana z kosztem alokacji
-        if self.allocation_matrix[task_index][resource_index] == 1:
+        if self.assignment[task_index] == resource_index:
             return 1 / (self.processing_times[task_index] * self.cost_matrix[task_index][resource_index])
         else:
             return 0
@@ -313,30 +769,16 @@ class CloudResourceAllocation:
          Oblicza całkowitą użyteczność aktualnego rozwiązania.
          Przykładowa implementacja - powinna być dostosowana do specyfiki problemu.
          """
-        total_utility = 0
-        for i in range(self.num_tasks):
-            for j in range(self.num_resources):
-                if self.allocation_matrix[i][j] == 1:
-                    total_utility += self.calculate_utility(i, j)
-        return total_utility
+        return self._task_utility_state().total
 
     def calculate_total_utility_after_reallocation(self, task_index, resource_index):
         """
         Oblicza całkowitą użyteczność po realokacji zadania.
         Przykładowa implementacja - powinna być dostosowana do specyfiki problemu.
         """
-        # Symulacja realokacji zadania
-        original_resource = self.get_current_resource(task_index)
-        self.allocation_matrix[task_index][original_resource] = 0
-        self.allocation_matrix[task_index][resource_index] = 1
-
-        # Obliczenie całkowitej użyteczności po realokacji
-        total_utility = self.calculate_total_utility()
-
-        # Przywrócenie oryginalnej alokacji
-        self.allocation_matrix[task_index][resource_index] = 0
-        self.allocation_matrix[task_index][original_resource] = 1
-        return total_utility
+        self.instrumentation.count('utility_evaluations')
+        # Użyteczność pozostałych zadań się nie zmienia - wystarczy podmienić składnik zadania task_index
+        return self._task_utility_state().total_if_moved(task_index, resource_index)
 
     def print_allocation_matrix(self, title="Macierz Alokacji"):
         """
@@ -347,35 +789,226 @@ class CloudResourceAllocation:
             print(' '.join(map(str, row)))
         print()
 
-    def brute_force_optimization(self):
+    @timed_phase('brute_force')
+    def brute_force_optimization(self, method='product', capacities=None, workers=None, initial=None,
+                                 tolerance=None, bound='row_minimum'):
+        """
+        Dokładne wyznaczenie przydziału o minimalnym koszcie całkowitym.
+
+        Parametry:
+        method (str): 'product' - pełny przegląd wszystkich przydziałów,
+                      'branch_and_bound' - metoda podziału i ograniczeń (solvers.branch_and_bound).
+        capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie (domyślnie bez ograniczeń).
+        workers (int | None): Liczba procesów dla metody podziału i ograniczeń.
+        initial (list[int] | None): Znany przydział będący początkowym górnym ograniczeniem metody podziału
+                                    i ograniczeń (rozgrzany start, np. z pamięci podręcznej rozwiązań).
+        tolerance (float | None): Dopuszczalna luka optymalności względem dolnego ograniczenia (lower_bound).
+                                  Przy podanej przegląd jest pomijany, jeśli bieżący przydział jest dopuszczalny
+                                  i osiąga lukę, a w przeciwnym razie kończy się po znalezieniu takiego przydziału.
+        bound (str): Dolne ograniczenie używane z tolerance: 'row_minimum' (tanie, dokładne bez pojemności)
+                     lub 'lp' (relaksacja liniowa - dokładna także przy pojemnościach, ale kosztowna).
+        """
+        if method not in ('product', 'branch_and_bound'):
+            raise ValueError(f"Nieznana metoda: {method}")
+        target = None
+        if tolerance is not None:
+            target = self._gap_target(tolerance, capacities, bound)
+            if self._is_feasible(capacities) and optimality_gap(self.calculate_total_cost(), target) == 0:
+                logger.info("Przydział ma certyfikat optymalności - pominięto pełny przegląd.")
+                self.instrumentation.count('certified_skips')
+                self._record_gap('brute_force', tolerance, capacities, bound)
+                return
+
+        candidates = [list(self._eligible(i)) for i in range(self.num_tasks)]
+        if method == 'branch_and_bound':
+            # Wagi tylko dla dopuszczalnych par zadanie-zasób
+            weights = [{j: self.calculate_single_task_cost(i, j) for j in candidates[i]}
+                       for i in range(self.num_tasks)]
+            best_allocation, _ = branch_and_bound(weights, capacities, workers, candidates, initial, target)
+            self.set_assignment(best_allocation)
+            self._record_gap('brute_force', tolerance, capacities, bound, exact=target is None)
+            return
+
         best_cost = float('inf')
         best_allocation = None
 
-        for allocation in itertools.product(range(self.num_resources), repeat=self.num_tasks):
+        for allocation in itertools.product(*candidates):
+            if capacities is not None and any(allocation.count(r) > capacities[r] for r in set(allocation)):
+                continue
             total_cost = 0
             for i, resource in enumerate(allocation):
                 total_cost += self.processing_times[i] * self.cost_matrix[i][resource]
             if total_cost < best_cost:
                 best_cost = total_cost
                 best_allocation = allocation
+                if target is not None and optimality_gap(best_cost, target) == 0:
+                    break
+
+        if best_allocation is None:
+            raise ValueError("Brak dopuszczalnego przydziału dla dopuszczalnych par i pojemności zasobów")
+        # Aktualizacja wektora przypisań
+        self.set_assignment(best_allocation)
+        self._record_gap('brute_force', tolerance, capacities, bound, exact=target is None)
+
+    def lower_bound(self, capacities=None, method='row_minimum'):
+        """
+        Dolne ograniczenie kosztu całkowitego (wyznaczane raz dla danej metody i pojemności).
 
-        # Aktualizacja macierzy alokacji
-        self.allocation_matrix = [[0 for _ in range(self.num_resources)] for _ in range(self.num_tasks)]
-        for task, resource in enumerate(best_allocation):
-            self.allocation_matrix[task][resource] = 1
+        Parametry:
+        capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie.
+        method (str): 'row_minimum' - suma najmniejszych kosztów zadań (bounds.row_minimum_bound), równa kosztowi
+                      optymalnemu bez pojemności i poprawna (słabsza) przy pojemnościach;
+                      'lp' - dodatkowo relaksacja liniowa z pojemnościami (bounds.lp_bound), kosztowna.
+        """
+        if method not in ('row_minimum', 'lp'):
+            raise ValueError(f"Nieznane ograniczenie: {method}")
+        if capacities is None or method == 'row_minimum':
+            key = None
+        else:
+            key = tuple(capacities)
+        if key not in self._lower_bounds:
+            if key is None:
+                self._lower_bounds[key] = row_minimum_bound(self.cost_matrix, self.processing_times)
+            else:
+                self._lower_bounds[key] = max(self.lower_bound(),
+                                              lp_bound(self.cost_matrix, self.processing_times, capacities))
+        return self._lower_bounds[key]
+
+    def optimality_gap(self, capacities=None, method='row_minimum'):
+        """
+        Względna luka optymalności bieżącego przydziału względem lower_bound(capacities, method).
+        """
+        return optimality_gap(self.calculate_total_cost(), self.lower_bound(capacities, method))
+
+    def _gap_target(self, tolerance, capacities=None, method='row_minimum'):
+        # Koszt, przy którym luka względem dolnego ograniczenia nie przekracza tolerance (None bez tolerance)
+        if tolerance is None:
+            return None
+        return self.lower_bound(capacities, method) * (1 + tolerance)
+
+    def _gap_reached(self, target):
+        # Koszt całkowity z przyrostowo utrzymywanego stanu obciążenia - O(1) po zbudowaniu stanu
+        return target is not None and optimality_gap(self._task_load_state().total, target) == 0
+
+    def _record_gap(self, phase, tolerance=None, capacities=None, method='row_minimum', exact=False):
+        if not self.record_gaps and tolerance is None:
+            return
+        # Pełny przegląd daje przydział optymalny, więc jego luki nie trzeba wyznaczać
+        self.gaps[phase] = gap = 0.0 if exact else self.optimality_gap(capacities, method)
+        logger.debug("Luka optymalności po %s: %.6g", phase, gap)
+
+    def _is_feasible(self, capacities=None):
+        """
+        Czy każde zadanie jest przypisane, a liczba zadań na zasobach nie przekracza pojemności.
+        """
+        if any(resource < 0 for resource in self.assignment):
+            return False
+        if capacities is None:
+            return True
+        counts = [0] * self.num_resources
+        for resource in self.assignment:
+            counts[resource] += 1
+        return all(count <= capacity for count, capacity in zip(counts, capacities))
 
     def calculate_total_cost(self):
         """
         Oblicza całkowity koszt alokacji zadań do zasobów.
         """
+        if self.instance is not None:
+            # Koszty ważone współdzielonej instancji, sumowane w kolejności zadań jak w pętli poniżej
+            return sum(self.instance.task_weights(self.assignment).tolist())
         total_cost = 0
-        for i in range(self.num_tasks):
-            for j in range(self.num_resources):
-                if self.allocation_matrix[i][j] == 1:
-                    total_cost += self.processing_times[i] * self.cost_matrix[i][j]
+        for i, j in enumerate(self.assignment):
+            if j >= 0:
+                total_cost += self.processing_times[i] * self.cost_matrix[i][j]
         return total_cost
 
 
+    def calculate_resource_loads(self):
+        """
+        Zwraca obciążenie każdego zasobu (suma kosztów przypisanych do niego zadań).
+        """
+        return list(self._task_load_state().load)
+
+    def calculate_makespan(self):
+        """
+        Oblicza makespan - obciążenie najbardziej obciążonego zasobu.
+        """
+        return self._task_load_state().makespan()
+
+    def calculate_load_imbalance(self):
+        """
+        Oblicza różnicę między obciążeniem najbardziej i najmniej obciążonego zasobu.
+        """
+        return self._task_load_state().imbalance()
+
+    def calculate_objective(self, objective='total'):
+        """
+        Wartość funkcji celu: 'total' - koszt całkowity, 'makespan' - największe obciążenie zasobu,
+        'balanced' - różnica między największym i najmniejszym obciążeniem.
+        """
+        if objective == 'total':
+            return self.calculate_total_cost()
+        if objective == 'makespan':
+            return self.calculate_makespan()
+        if objective == 'balanced':
+            return self.calculate_load_imbalance()
+        raise ValueError(f"Nieznana funkcja celu: {objective}")
+
+    def calculate_objective_after_reallocation(self, task_index, resource_index, objective='total'):
+        """
+        Wartość funkcji celu po przeniesieniu zadania do zasobu resource_index, bez modyfikowania przypisań.
+        Dla 'makespan' i 'balanced' liczona w czasie O(log R) z kopców stanu obciążenia.
+        """
+        current_resource = self.assignment[task_index]
+        state = self._task_load_state()
+        if objective == 'total':
+            return state.total_if_moved(task_index, current_resource, resource_index)
+        if objective == 'makespan':
+            return state.makespan_if_moved(task_index, current_resource, resource_index)
+        if objective == 'balanced':
+            return state.imbalance_if_moved(task_index, current_resource, resource_index)
+        raise ValueError(f"Nieznana funkcja celu: {objective}")
+
+    @timed_phase('minimize_load')
+    def minimize_load(self, objective='makespan', max_moves=None, tolerance=None):
+        """
+        Przeszukiwanie lokalne zmniejszające makespan lub różnicę obciążeń zasobów.
+
+        W każdym kroku rozważane są przeniesienia zadań z najbardziej obciążonego zasobu na dowolny
+        dopuszczalny zasób i wykonywane jest to, które najbardziej poprawia funkcję celu.
+        Kończy się, gdy żadne przeniesienie nie poprawia funkcji celu, po max_moves realokacjach
+        lub - przy podanej tolerance - gdy luka optymalności kosztu całkowitego względem lower_bound ją osiągnie.
+
+        Zwraca:
+        int: Liczba wykonanych realokacji.
+        """
+        if objective not in ('makespan', 'balanced'):
+            raise ValueError(f"Funkcja celu musi być 'makespan' lub 'balanced': {objective}")
+        state = self._task_load_state()
+        target = self._gap_target(tolerance)
+        moves = 0
+        while (max_moves is None or moves < max_moves) and self.num_resources > 0:
+            if self._gap_reached(target):
+                break
+            current = self.calculate_objective(objective)
+            _, loaded = state.max_load()
+            best = None
+            for task in state.tasks_on[loaded]:
+                for resource in self._eligible(task):
+                    if resource == loaded:
+                        continue
+                    value = self.calculate_objective_after_reallocation(task, resource, objective)
+                    if value < current and (best is None or value < best[0]):
+                        best = (value, task, resource)
+            if best is None:
+                break
+            _, task, resource = best
+            self.perform_reallocation(task, loaded, resource)
+            moves += 1
+        self._record_gap('minimize_load', tolerance)
+        return moves
+
     def run(self):
         # Uruchomienie początkowej optymalizacji
         self.initial_optimization()
@@ -1,110 +1,109 @@
-from matplotlib import pyplot as plt
-
 from clourd_resource import CloudResourceAllocation
+from experiments import run_trials
 from generators import generate_cost_matrix, generate_processing_times
-
-
-def compare_different_number_of_resources(num_tasks, max_resources, trials=5):
-    resources_costs_initial = []
-    resources_costs_final = []
-    for num_resources in range(1, max_resources + 1):
-        cost_initial, cost_final = [], []
-        for _ in range(trials):
-            cost_matrix = generate_cost_matrix(num_tasks, num_resources)
-            processing_times = generate_processing_times(num_tasks)
-            system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
-            system.initial_optimization()
-            cost_initial.append(system.calculate_total_cost())
-            system.minimize_splr()
-            system.minimize_gelr()
-            system.evolutionary_optimization()
-            cost_final.append(system.calculate_total_cost())
-        resources_costs_initial.append(sum(cost_initial) / trials)
-        resources_costs_final.append(sum(cost_final) / trials)
+from instance import Instance
+
+
+def _optimization_trial(num_tasks, num_resources):
+    """
+    Pojedyncza próba: optymalizacja początkowa i pełny łańcuch SPLR -> GELR -> ewolucyjna.
+    Zwraca koszt po optymalizacji początkowej i koszt końcowy.
+    """
+    cost_matrix = generate_cost_matrix(num_tasks, num_resources)
+    processing_times = generate_processing_times(num_tasks)
+    system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    system.initial_optimization()
+    cost_initial = system.calculate_total_cost()
+    system.minimize_splr()
+    system.minimize_gelr()
+    system.evolutionary_optimization()
+    return cost_initial, system.calculate_total_cost()
+
+
+def _initialization_trial(num_tasks, num_resources):
+    cost_matrix = generate_cost_matrix(num_tasks, num_resources)
+    processing_times = generate_processing_times(num_tasks)
+    # Obie metody działają na jednej współdzielonej instancji
+    instance = Instance(cost_matrix, processing_times)
+
+    # Losowa inicjalizacja
+    system_random = CloudResourceAllocation.from_instance(instance)
+    system_random.random_initialization()
+
+    # Inicjalizacja początkowa
+    system_initial = CloudResourceAllocation.from_instance(instance)
+    system_initial.initial_optimization()
+    return system_random.calculate_total_cost(), system_initial.calculate_total_cost()
+
+
+def _brute_force_trial(num_tasks, num_resources):
+    cost_matrix = generate_cost_matrix(num_tasks, num_resources)
+    processing_times = generate_processing_times(num_tasks)
+
+    # Optymalizacja za pomocą istniejących metod
+    system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    system.initial_optimization()
+    optimized_cost = system.calculate_total_cost()
+
+    # Podejście Brute Force - pomijane, gdy dolne ograniczenie potwierdza optymalność optymalizacji początkowej
+    system.brute_force_optimization(tolerance=0.0)
+    return optimized_cost, system.calculate_total_cost()
+
+
+def _average_by_size(results, sizes, trials):
+    """
+    Uśrednia wyniki prób ułożone kolejno po trials dla każdego rozmiaru.
+    """
+    return [sum(results[k * trials:(k + 1) * trials]) / trials for k in range(len(sizes))]
+
+
+def compare_different_number_of_resources(num_tasks, max_resources, trials=5, master_seed=None, workers=None,
+                                          chunksize=1, sink=None):
+    sizes = range(1, max_resources + 1)
+    items = [((num_tasks, num_resources), trial) for num_resources in sizes for trial in range(trials)]
+    results = run_trials(_optimization_trial, 'different_number_of_resources', items, master_seed, workers,
+                         chunksize, sink)
+    resources_costs_initial = _average_by_size([initial for initial, _ in results], sizes, trials)
+    resources_costs_final = _average_by_size([final for _, final in results], sizes, trials)
     return resources_costs_initial, resources_costs_final
 
 
-def compare_initialization_methods(num_tasks, num_resources, trials=10):
-    random_costs = []
-    initial_costs = []
-    for _ in range(trials):
-        cost_matrix = generate_cost_matrix(num_tasks, num_resources)
-        processing_times = generate_processing_times(num_tasks)
-
-        # Losowa inicjalizacja
-        system_random = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
-        system_random.random_initialization()
-        random_costs.append(system_random.calculate_total_cost())
-
-        # Inicjalizacja początkowa
-        system_initial = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
-        system_initial.initial_optimization()
-        initial_costs.append(system_initial.calculate_total_cost())
-
-    # Generowanie wykresu
-    plt.figure()
-    plt.boxplot([random_costs, initial_costs], labels=['Losowa', 'Początkowa'])
-    plt.ylabel('Koszt')
-    plt.title('Porównanie Metod Inicjalizacji')
-    plt.savefig('PorównanieMetodInicjalizacji.jpg')
-
-
-def compare_tasks_resources(max_tasks, max_resources, trials=5):
-    tasks_costs = []
-    for num_tasks in range(1, max_tasks + 1):
-        cost = []
-        for _ in range(trials):
-            cost_matrix = generate_cost_matrix(num_tasks, max_resources)
-            processing_times = generate_processing_times(num_tasks)
-            system = CloudResourceAllocation(num_tasks, max_resources, cost_matrix, processing_times)
-            system.initial_optimization()
-            system.minimize_splr()
-            system.minimize_gelr()
-            system.evolutionary_optimization()
-            cost.append(system.calculate_total_cost())
-        tasks_costs.append(sum(cost) / trials)
-
-    resources_costs = []
-    for num_resources in range(1, max_resources + 1):
-        cost = []
-        for _ in range(trials):
-            cost_matrix = generate_cost_matrix(max_tasks, num_resources)
-            processing_times = generate_processing_times(max_tasks)
-            system = CloudResourceAllocation(max_tasks, num_resources, cost_matrix, processing_times)
-            system.initial_optimization()
-            system.minimize_splr()
-            system.minimize_gelr()
-            system.evolutionary_optimization()
-            cost.append(system.calculate_total_cost())
-        resources_costs.append(sum(cost) / trials)
-
+def compare_initialization_methods(num_tasks, num_resources, trials=10, master_seed=None, workers=None,
+                                   chunksize=1, sink=None):
+    items = [((num_tasks, num_resources), trial) for trial in range(trials)]
+    results = run_trials(_initialization_trial, 'initialization_methods', items, master_seed, workers, chunksize,
+                         sink)
+    random_costs = [random_cost for random_cost, _ in results]
+    initial_costs = [initial_cost for _, initial_cost in results]
+    # Wykres generuje reports.plot_initialization_methods
+    return random_costs, initial_costs
+
+
+def compare_tasks_resources(max_tasks, max_resources, trials=5, master_seed=None, workers=None, chunksize=1,
+                            sink=None):
+    task_sizes = range(1, max_tasks + 1)
+    resource_sizes = range(1, max_resources + 1)
+    # Identyfikator próby zawiera nazwę serii, aby próby o tym samym rozmiarze w obu seriach były niezależne
+    task_items = [((num_tasks, max_resources), ('tasks', trial)) for num_tasks in task_sizes
+                  for trial in range(trials)]
+    resource_items = [((max_tasks, num_resources), ('resources', trial)) for num_resources in resource_sizes
+                      for trial in range(trials)]
+    # Obie serie w jednym wywołaniu, aby pula procesów była wykorzystana przez cały przebieg
+    results = run_trials(_optimization_trial, 'tasks_resources', task_items + resource_items, master_seed, workers,
+                         chunksize, sink)
+    final_costs = [final for _, final in results]
+
+    tasks_costs = _average_by_size(final_costs[:len(task_items)], task_sizes, trials)
+    resources_costs = _average_by_size(final_costs[len(task_items):], resource_sizes, trials)
     return tasks_costs, resources_costs
 
 
-def compare_brute_force_performance(num_tasks, num_resources, trials=10):
-    optimized_costs = []
-    brute_force_costs = []
-
-    for _ in range(trials):
-        cost_matrix = generate_cost_matrix(num_tasks, num_resources)
-        processing_times = generate_processing_times(num_tasks)
-
-        # Optymalizacja za pomocą istniejących metod
-        system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
-        system.initial_optimization()
-        optimized_costs.append(system.calculate_total_cost())
-
-        # Podejście Brute Force
-        system.brute_force_optimization()
-        brute_force_costs.append(system.calculate_total_cost())
-
-    # Generowanie wykresu
-    plt.figure()
-    plt.boxplot([optimized_costs, brute_force_costs], labels=['Optymalizowane', 'Brute Force'])
-    plt.ylabel('Koszt')
-    plt.title('Porównanie Wydajności Brute Force')
-    plt.savefig('PorównanieWydajnościBruteForce.jpg')
-
-    # Zwracanie średnich kosztów
-    return sum(optimized_costs) / len(optimized_costs), sum(brute_force_costs) / len(brute_force_costs)
-
+def compare_brute_force_performance(num_tasks, num_resources, trials=10, master_seed=None, workers=None,
+                                    chunksize=1, sink=None):
+    items = [((num_tasks, num_resources), trial) for trial in range(trials)]
+    results = run_trials(_brute_force_trial, 'brute_force_performance', items, master_seed, workers, chunksize,
+                         sink)
+    optimized_costs = [optimized for optimized, _ in results]
+    brute_force_costs = [brute_force for _, brute_force in results]
+    # Wykres generuje reports.plot_brute_force_performance
+    return optimized_costs, brute_force_costs
@@ -0,0 +1,295 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from sparse import row_items
+
+
+class GlobalCostState:
+    """
+    Stan kosztu globalnego alokacji.
+
+    Przechowuje bieżącą sumę kosztów cost_matrix[t][assignment[t]] dla wszystkich przypisanych zadań
+    oraz dwa najtańsze (dopuszczalne) zasoby każdego zadania, dzięki czemu koszt globalny po przeniesieniu zadania
+    i najtańszy zasób z pominięciem wskazanego są liczone w czasie O(1).
+    """
+
+    def __init__(self, cost_matrix, assignment, ranked=None):
+        self.cost_matrix = cost_matrix
+        if ranked is not None:
+            # Dwa najtańsze zasoby wyznaczone wcześniej (instance.Instance.best / second) - tylko do odczytu
+            self.best, self.second = ranked
+            self.total = 0
+            self.reset(assignment)
+            return
+        self.best = array('i')
+        self.second = array('i')
+        for task in range(len(cost_matrix)):
+            best, second = -1, -1
+            best_cost = second_cost = None
+            for r, cost in row_items(cost_matrix, task):
+                if best == -1 or cost < best_cost:
+                    best, second = r, best
+                    best_cost, second_cost = cost, best_cost
+                elif second == -1 or cost < second_cost:
+                    second, second_cost = r, cost
+            self.best.append(best)
+            self.second.append(second)
+        self.total = 0
+        self.reset(assignment)
+
+    def reset(self, assignment):
+        """
+        Przelicza sumę kosztów od nowa dla całego wektora przypisań.
+        """
+        total = 0
+        for task, resource in enumerate(assignment):
+            if resource >= 0:
+                total += self.cost_matrix[task][resource]
+        self.total = total
+
+    def cost_if_moved(self, task, current_resource, resource):
+        """
+        Zwraca koszt globalny, gdyby zadanie task zostało przypisane do zasobu resource.
+        """
+        row = self.cost_matrix[task]
+        if current_resource >= 0:
+            return self.total - row[current_resource] + row[resource]
+        return self.total + row[resource]
+
+    def move(self, task, old_resource, new_resource):
+        """
+        Aktualizuje sumę kosztów po przeniesieniu zadania z old_resource do new_resource.
+        """
+        self.total = self.cost_if_moved(task, old_resource, new_resource)
+
+    def best_excluding(self, task, resource):
+        """
+        Zwraca najtańszy zasób zadania task różny od resource (-1, jeśli taki nie istnieje).
+        Przy równych kosztach wybierany jest zasób o najniższym indeksie.
+        """
+        best = self.best[task]
+        return best if best != resource else self.second[task]
+
+
+class UtilityState:
+    """
+    Stan użyteczności alokacji.
+
+    Przechowuje użyteczność każdego zadania przy bieżącym przypisaniu oraz ich sumę.
+    Użyteczność po hipotetycznej realokacji liczona jest jako przyrost O(1), bez modyfikowania przypisań,
+    więc odczyty są wolne od efektów ubocznych.
+    """
+
+    def __init__(self, cost_matrix, processing_times, assignment, instance=None):
+        self.cost_matrix = cost_matrix
+        self.processing_times = processing_times
+        # Współdzielona instancja (instance.Instance) - przeliczenie całego przypisania czyta jej koszty ważone
+        self.instance = instance
+        self.task_utility = array('d', [0.0] * len(assignment))
+        self.total = 0.0
+        self.reset(assignment)
+
+    def utility(self, task, resource):
+        """
+        Użyteczność zadania task przypisanego do zasobu resource.
+        """
+        return 1 / (self.processing_times[task] * self.cost_matrix[task][resource])
+
+    def reset(self, assignment):
+        """
+        Przelicza użyteczności wszystkich zadań od nowa dla całego wektora przypisań.
+        """
+        if self.instance is not None:
+            weights = self.instance.task_weights(assignment)
+            assigned = np.flatnonzero(np.asarray(assignment) >= 0)
+            utilities = np.zeros(len(weights))
+            with np.errstate(divide='ignore'):
+                utilities[assigned] = 1 / weights[assigned]
+            self.task_utility = array('d', utilities.tolist())
+            self.total = sum(self.task_utility, 0.0)
+            return
+        total = 0.0
+        for task, resource in enumerate(assignment):
+            utility = self.utility(task, resource) if resource >= 0 else 0.0
+            self.task_utility[task] = utility
+            total += utility
+        self.total = total
+
+    def total_if_moved(self, task, resource):
+        """
+        Zwraca całkowitą użyteczność, gdyby zadanie task zostało przypisane do zasobu resource.
+        """
+        return self.total - self.task_utility[task] + self.utility(task, resource)
+
+    def gelr(self, task, resource):
+        """
+        Zmiana całkowitej użyteczności wywołana przeniesieniem zadania task do zasobu resource.
+        """
+        return abs(self.task_utility[task] - self.utility(task, resource))
+
+    def move(self, task, new_resource):
+        """
+        Aktualizuje użyteczność zadania i sumę po przeniesieniu zadania do new_resource.
+        """
+        utility = self.utility(task, new_resource)
+        self.total += utility - self.task_utility[task]
+        self.task_utility[task] = utility
+
+
+class LoadState:
+    """
+    Stan obciążenia zasobów.
+
+    Obciążenie zasobu to suma kosztów pojedynczych zadań (processing_times[t] * cost_matrix[t][r]) przypisanych
+    do niego, więc suma obciążeń równa jest kosztowi całkowitemu. Dla każdego zasobu przechowywany jest zbiór
+    przypisanych zadań, a kopce z leniwym usuwaniem wpisów pozwalają odczytać najbardziej i najmniej obciążony
+    zasób oraz makespan po hipotetycznym przeniesieniu zadania w czasie O(log R).
+    """
+
+    def __init__(self, cost_matrix, processing_times, num_resources, assignment, instance=None):
+        self.cost_matrix = cost_matrix
+        self.processing_times = processing_times
+        # Współdzielona instancja (instance.Instance) - przeliczenie całego przypisania czyta jej koszty ważone
+        self.instance = instance
+        self.load = array('d', [0.0] * num_resources)
+        self.tasks_on = [set() for _ in range(num_resources)]
+        self.total = 0.0
+        self._max_heap = []
+        self._min_heap = []
+        self.reset(assignment)
+
+    def weight(self, task, resource):
+        return self.processing_times[task] * self.cost_matrix[task][resource]
+
+    def reset(self, assignment):
+        """
+        Przelicza obciążenia i indeks zadań od nowa dla całego wektora przypisań.
+        """
+        for resource in range(len(self.load)):
+            self.load[resource] = 0.0
+            self.tasks_on[resource].clear()
+        if self.instance is not None:
+            resources = np.asarray(assignment, dtype=np.int64)
+            assigned = np.flatnonzero(resources >= 0)
+            # bincount sumuje w kolejności zadań - tak samo jak pętla poniżej
+            loads = np.bincount(resources[assigned], weights=self.instance.task_weights(assignment)[assigned],
+                                minlength=len(self.load))
+            self.load = array('d', loads.tolist())
+            for task in assigned.tolist():
+                self.tasks_on[resources[task]].add(task)
+        else:
+            for task, resource in enumerate(assignment):
+                if resource >= 0:
+                    self.load[resource] += self.weight(task, resource)
+                    self.tasks_on[resource].add(task)
+        self.total = sum(self.load)
+        self._max_heap = [(-load, resource) for resource, load in enumerate(self.load)]
+        self._min_heap = [(load, resource) for resource, load in enumerate(self.load)]
+        heapq.heapify(self._max_heap)
+        heapq.heapify(self._min_heap)
+
+    def move(self, task, old_resource, new_resource):
+        """
+        Aktualizuje obciążenia, indeks zadań i kopce po przeniesieniu zadania z old_resource do new_resource.
+        """
+        if old_resource >= 0:
+            self.load[old_resource] -= self.weight(task, old_resource)
+            self.total -= self.weight(task, old_resource)
+            self.tasks_on[old_resource].discard(task)
+            self._push(old_resource)
+        if new_resource >= 0:
+            self.load[new_resource] += self.weight(task, new_resource)
+            self.total += self.weight(task, new_resource)
+            self.tasks_on[new_resource].add(task)
+            self._push(new_resource)
+
+    def _push(self, resource):
+        # Nieaktualne wpisy zostają w kopcach i są pomijane przy odczycie; po zbyt dużym wzroście kopce są odbudowywane
+        if len(self._max_heap) > 4 * len(self.load):
+            self._max_heap = [(-load, r) for r, load in enumerate(self.load)]
+            self._min_heap = [(load, r) for r, load in enumerate(self.load)]
+            heapq.heapify(self._max_heap)
+            heapq.heapify(self._min_heap)
+            return
+        load = self.load[resource]
+        heapq.heappush(self._max_heap, (-load, resource))
+        heapq.heappush(self._min_heap, (load, resource))
+
+    def _top(self, heap, sign, exclude=()):
+        """
+        Zwraca (obciążenie, zasób) wierzchołka kopca z pominięciem zasobów exclude (None dla pustego wyniku).
+        """
+        skipped = []
+        result = None
+        while heap:
+            key, resource = heap[0]
+            if key != sign * self.load[resource]:
+                heapq.heappop(heap)  # Nieaktualny wpis
+                continue
+            if resource in exclude:
+                skipped.append(heapq.heappop(heap))
+                continue
+            result = (sign * key, resource)
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return result
+
+    def max_load(self, exclude=()):
+        return self._top(self._max_heap, -1, exclude)
+
+    def min_load(self, exclude=()):
+        return self._top(self._min_heap, 1, exclude)
+
+    def makespan(self):
+        top = self.max_load()
+        return top[0] if top is not None else 0.0
+
+    def imbalance(self):
+        if not self.load:
+            return 0.0
+        return self.max_load()[0] - self.min_load()[0]
+
+    def _loads_if_moved(self, task, old_resource, new_resource):
+        changed = {}
+        if old_resource >= 0:
+            changed[old_resource] = self.load[old_resource] - self.weight(task, old_resource)
+        if new_resource >= 0:
+            changed[new_resource] = changed.get(new_resource, self.load[new_resource]) + self.weight(task, new_resource)
+        return changed
+
+    def total_if_moved(self, task, old_resource, new_resource):
+        """
+        Suma obciążeń (koszt całkowity) po przeniesieniu zadania z old_resource do new_resource.
+        """
+        total = self.total
+        if old_resource >= 0:
+            total -= self.weight(task, old_resource)
+        if new_resource >= 0:
+            total += self.weight(task, new_resource)
+        return total
+
+    def makespan_if_moved(self, task, old_resource, new_resource):
+        """
+        Makespan po przeniesieniu zadania z old_resource do new_resource, bez modyfikowania stanu.
+        """
+        changed = self._loads_if_moved(task, old_resource, new_resource)
+        loads = list(changed.values())
+        other = self.max_load(changed)
+        if other is not None:
+            loads.append(other[0])
+        return max(loads) if loads else 0.0
+
+    def imbalance_if_moved(self, task, old_resource, new_resource):
+        """
+        Różnica między największym i najmniejszym obciążeniem po przeniesieniu zadania, bez modyfikowania stanu.
+        """
+        changed = self._loads_if_moved(task, old_resource, new_resource)
+        loads = list(changed.values())
+        highest = self.max_load(changed)
+        lowest = self.min_load(changed)
+        if highest is not None:
+            loads += [highest[0], lowest[0]]
+        return max(loads) - min(loads) if loads else 0.0
@@ -0,0 +1,165 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from clourd_resource import CloudResourceAllocation
+from sparse import SparseCostMatrix, row_items
+
+
+def partition(cost_matrix, num_resources, neighbours=2):
+    """
+    Dzieli instancję na niezależne bloki zadań i zasobów.
+
+    Zadanie łączone jest krawędzią ze wszystkimi dopuszczalnymi zasobami (macierz rzadka) albo z neighbours
+    najtańszymi zasobami (macierz gęsta). Bloki to spójne składowe tego grafu dwudzielnego, więc tanie zasoby
+    zadań z różnych bloków są rozłączne.
+
+    Zwraca:
+    list[tuple[list[int], list[int]]]: Zadania i zasoby każdego bloku zawierającego zadania,
+                                       od największego bloku.
+    """
+    num_tasks = len(cost_matrix)
+    # Find-union na wierzchołkach: zadania 0..T-1, zasoby T..T+R-1
+    parent = list(range(num_tasks + num_resources))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    if isinstance(cost_matrix, SparseCostMatrix):
+        edges = ((task, cost_matrix.eligible_resources(task)) for task in range(num_tasks))
+    else:
+        costs = np.asarray(cost_matrix, dtype=float)
+        cheapest = np.argsort(costs, axis=1, kind='stable')[:, :neighbours] if num_tasks else []
+        edges = ((task, cheapest[task].tolist()) for task in range(num_tasks))
+    for task, resources in edges:
+        for resource in resources:
+            parent[find(task)] = find(num_tasks + resource)
+
+    blocks = {}
+    for node in range(num_tasks + num_resources):
+        tasks, resources = blocks.setdefault(find(node), ([], []))
+        if node < num_tasks:
+            tasks.append(node)
+        else:
+            resources.append(node - num_tasks)
+    return sorted((block for block in blocks.values() if block[0]), key=lambda block: -len(block[0]))
+
+
+def _sub_instance(cost_matrix, tasks, resources):
+    """
+    Macierz kosztów bloku: wiersze zadań tasks i kolumny zasobów resources (indeksy lokalne).
+    """
+    if isinstance(cost_matrix, SparseCostMatrix):
+        local = {resource: j for j, resource in enumerate(resources)}
+        return SparseCostMatrix.from_rows(len(resources), [
+            {local[r]: cost for r, cost in cost_matrix.row_items(task) if r in local} for task in tasks])
+    return np.asarray(cost_matrix, dtype=float)[np.ix_(tasks, resources)]
+
+
+def _solve_block(cost_matrix, processing_times, phase, params, capacities):
+    """
+    Rozwiązuje blok istniejącą metodą CloudResourceAllocation; zwraca przypisanie w indeksach lokalnych
+    (same -1, jeśli blok nie ma dopuszczalnego rozwiązania).
+    """
+    num_tasks = len(processing_times)
+    num_resources = cost_matrix.num_resources if isinstance(cost_matrix, SparseCostMatrix) else cost_matrix.shape[1]
+    system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    if capacities is not None:
+        params = dict(params, capacities=capacities)
+    try:
+        getattr(system, phase)(**params)
+    except ValueError:
+        return [-1] * num_tasks
+    return list(system.assignment)
+
+
+def optimize_by_blocks(system, phase='brute_force_optimization', params=None, capacities=None, neighbours=2,
+                       workers=None, tolerance=None):
+    """
+    Optymalizacja z dekompozycją: podział na bloki (partition), równoległe rozwiązanie bloków metodą phase
+    i naprawa granic ruchami SPLR. Czas rozwiązania zależy od rozmiaru największego bloku, a nie całej instancji.
+
+    Bez ograniczeń pojemności połączenie rozwiązań bloków nie traci optymalności, bo najtańsze zasoby
+    każdego zadania leżą w jego bloku. Przy ograniczonych pojemnościach zadania, które nie zmieściły się
+    na tanich zasobach swojego bloku, są w naprawie przenoszone na najtańsze zasoby z wolną pojemnością
+    w całej instancji.
+
+    Parametry:
+    system (CloudResourceAllocation): Alokacja, której przypisanie zostaje zastąpione wynikiem.
+    phase (str): Metoda CloudResourceAllocation rozwiązująca blok (domyślnie brute_force_optimization).
+    params (dict | None): Argumenty metody phase (domyślnie {'method': 'branch_and_bound'} dla brute force).
+    capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie (przekazywana blokom).
+    neighbours (int): Liczba najtańszych zasobów zadania łączonych w blok (macierz gęsta).
+    workers (int | None): Liczba procesów; None lub 1 oznacza wykonanie w bieżącym procesie.
+    tolerance (float | None): Dopuszczalna luka optymalności przekazywana metodzie phase w każdym bloku
+                              (metoda musi przyjmować argument tolerance). Najtańsze zasoby zadania leżą w jego
+                              bloku, więc suma ograniczeń bloków równa jest ograniczeniu całej instancji.
+                              Luka wyniku zapisywana jest w system.gaps.
+
+    Zwraca:
+    list[tuple[list[int], list[int]]]: Bloki (zadania, zasoby) od największego.
+    """
+    if params is None:
+        params = {'method': 'branch_and_bound'} if phase == 'brute_force_optimization' else {}
+    if tolerance is not None:
+        params = dict(params, tolerance=tolerance)
+    blocks = partition(system.cost_matrix, system.num_resources, neighbours)
+    jobs = [(_sub_instance(system.cost_matrix, tasks, resources),
+             [system.processing_times[task] for task in tasks], phase, params,
+             [capacities[r] for r in resources] if capacities is not None else None)
+            for tasks, resources in blocks]
+
+    if workers is None or workers <= 1:
+        results = [_solve_block(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_solve_block, *zip(*jobs)))
+
+    assignment = [-1] * system.num_tasks
+    for (tasks, resources), local in zip(blocks, results):
+        for task, resource in zip(tasks, local):
+            assignment[task] = resources[resource] if resource >= 0 else -1
+    system.set_assignment(assignment)
+    repair_boundaries(system, capacities)
+    system._record_gap('optimize_by_blocks', tolerance, capacities)
+    return blocks
+
+
+def repair_boundaries(system, capacities=None):
+    """
+    Ruchy SPLR na granicach bloków: każde zadanie, które nie stoi na swoim najtańszym zasobie
+    (lub jest nieprzypisane), przenoszone jest na zasób o najmniejszym koszcie pojedynczego zadania
+    z wolną pojemnością. Przebiegi powtarzane są, dopóki któryś ruch obniża koszt.
+
+    Zwraca:
+    int: Liczba wykonanych realokacji.
+    """
+    load = [0] * system.num_resources
+    for resource in system.assignment:
+        if resource >= 0:
+            load[resource] += 1
+    moves = 0
+    changed = True
+    while changed:
+        changed = False
+        for task in range(system.num_tasks):
+            current = system.assignment[task]
+            current_cost = system.calculate_single_task_cost(task, current) if current >= 0 else float('inf')
+            best, best_cost = -1, current_cost
+            for resource, cost in row_items(system.cost_matrix, task):
+                if resource == current or (capacities is not None and load[resource] >= capacities[resource]):
+                    continue
+                cost = system.processing_times[task] * cost
+                if cost < best_cost:
+                    best, best_cost = resource, cost
+            if best >= 0:
+                if current >= 0:
+                    load[current] -= 1
+                load[best] += 1
+                system.perform_reallocation(task, current, best)
+                moves += 1
+                changed = True
+    return moves
@@ -0,0 +1,98 @@
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def derive_seed(master_seed, key):
+    """
+    Wyznacza ziarno generatora dla pojedynczej jednostki pracy.
+
+    Parametry:
+    master_seed (int): Ziarno główne całego eksperymentu.
+    key (tuple): Identyfikator jednostki pracy, np. (nazwa eksperymentu, rozmiar, numer próby).
+
+    Zwraca:
+    int: Ziarno zależne wyłącznie od master_seed i key - niezależne od kolejności wykonania i liczby procesów.
+    """
+    return random.Random(f"{master_seed}:{key!r}").getrandbits(64)
+
+
+def run_trials(trial, experiment, items, master_seed=None, workers=None, chunksize=1, sink=None):
+    """
+    Uruchamia funkcję trial dla każdej jednostki pracy, opcjonalnie w puli procesów.
+
+    Parametry:
+    trial (callable): Funkcja na poziomie modułu wywoływana jako trial(*args); musi dać się zserializować (pickle).
+    experiment (str): Nazwa eksperymentu - rozróżnia ziarna jednostek o tych samych argumentach.
+    items (list[tuple]): Jednostki pracy w postaci (args, identyfikator próby), np. ((num_tasks, num_resources), 0).
+    master_seed (int | None): Ziarno główne; None oznacza losowe ziarno z globalnego generatora random.
+    workers (int | None): Liczba procesów; None lub 1 oznacza wykonanie w bieżącym procesie.
+    chunksize (int): Liczba jednostek przekazywanych do procesu jednocześnie.
+    sink (files.StreamingResultWriter | None): Zapis wyniku każdej jednostki zaraz po jej zakończeniu (w kolejności
+                                               kończenia); jednostki zakończone wcześniej z tym samym
+                                               master_seed są pomijane.
+
+    Zwraca:
+    list: Wyniki w kolejności items. Przy tym samym master_seed wyniki są identyczne niezależnie od workers.
+    """
+    if master_seed is None:
+        master_seed = random.getrandbits(64)
+    keys = [(experiment, args, trial_index) for args, trial_index in items]
+    seeds = [derive_seed(master_seed, key) for key in keys]
+
+    results = [None] * len(items)
+    pending = []
+    for index, key in enumerate(keys):
+        if sink is not None:
+            found, result = sink.lookup(master_seed, key)
+            if found:
+                results[index] = result
+                continue
+        pending.append(index)
+
+    def collect(index, result):
+        results[index] = result
+        if sink is not None:
+            sink.write(master_seed, keys[index], seeds[index], result)
+
+    if workers is None or workers <= 1:
+        for index in pending:
+            collect(index, _run_job((trial, seeds[index], items[index][0])))
+        return results
+
+    # Paczki po chunksize jednostek; wynik paczki zapisywany jest, gdy tylko się zakończy, więc wolna jednostka
+    # nie wstrzymuje zapisu pozostałych, a błąd jednej paczki nie powoduje utraty wyników już zakończonych
+    chunksize = max(1, chunksize)
+    chunks = [pending[start:start + chunksize] for start in range(0, len(pending), chunksize)]
+    error = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_jobs, [(trial, seeds[index], items[index][0]) for index in chunk]): chunk
+                   for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                outputs = future.result()
+            except Exception as exception:
+                error = error or exception
+                continue
+            for index, result in zip(futures[future], outputs):
+                collect(index, result)
+    if error is not None:
+        raise error
+    return results
+
+
+def _run_jobs(jobs):
+    return [_run_job(job) for job in jobs]
+
+
+def _run_job(job):
+    """
+    Wykonuje jedną jednostkę pracy z własnym ziarnem globalnego generatora random,
+    przywracając następnie poprzedni stan generatora.
+    """
+    trial, seed, args = job
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return trial(*args)
+    finally:
+        random.setstate(state)
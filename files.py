@@ -1,4 +1,6 @@
 import csv
+import json
+import os
 
 
 def save_results_to_csv(filename, headers, data):
@@ -6,3 +8,88 @@ def save_results_to_csv(filename, headers, data):
         writer = csv.writer(file)
         writer.writerow(headers)
         writer.writerows(data)
+
+
+def save_results_to_json(filename, data):
+    with open(filename, mode='w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+
+
+class StreamingResultWriter:
+    """
+    Strumieniowy zapis wyników pojedynczych jednostek pracy (eksperyment, rozmiar, próba).
+
+    Każdy wiersz jest dopisywany do pliku CSV i natychmiast zapisywany na dysk, a w manifeście
+    (plik JSON Lines) odnotowywany jest klucz jednostki wraz z wynikiem. Ponowne uruchomienie z tym samym
+    ziarnem głównym pomija jednostki obecne w manifeście i odtwarza ich wyniki.
+    """
+    headers = ["Experiment", "Parameters", "Trial", "Seed", "Result"]
+
+    def __init__(self, filename, manifest_filename=None):
+        self.filename = filename
+        self.manifest_filename = manifest_filename or f"{filename}.manifest.jsonl"
+        self.completed = {}
+        # Liczba jednostek odtworzonych z manifestu zamiast ponownie wykonanych
+        self.replayed = 0
+        if os.path.exists(self.manifest_filename):
+            with open(self.manifest_filename, encoding='utf-8') as manifest:
+                for line in manifest:
+                    if not line.strip():
+                        continue  # Pusta linia
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Niedokończony zapis przerwanego przebiegu
+                    self.completed[(entry['master_seed'], entry['key'])] = entry['result']
+
+        write_headers = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self._file = open(filename, mode='a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._manifest = open(self.manifest_filename, mode='a', encoding='utf-8')
+        if write_headers:
+            self._writer.writerow(self.headers)
+            self._file.flush()
+
+    def lookup(self, master_seed, key):
+        """
+        Zwraca (True, wynik) dla jednostki zakończonej wcześniej lub (False, None).
+        """
+        entry = self.completed.get((master_seed, repr(key)), _MISSING)
+        if entry is _MISSING:
+            return False, None
+        self.replayed += 1
+        return True, tuple(entry) if isinstance(entry, list) else entry
+
+    def write(self, master_seed, key, seed, result):
+        """
+        Dopisuje wynik jednostki do pliku CSV i manifestu.
+        """
+        experiment, args, trial_index = key
+        result = json.loads(json.dumps(result, default=_to_builtin))
+        self._writer.writerow([experiment, json.dumps(list(args), default=_to_builtin), trial_index, seed,
+                               json.dumps(result)])
+        self._file.flush()
+        self._manifest.write(json.dumps({'master_seed': master_seed, 'key': repr(key), 'result': result}) + '\n')
+        self._manifest.flush()
+        os.fsync(self._manifest.fileno())
+        self.completed[(master_seed, repr(key))] = result
+
+    def close(self):
+        self._file.close()
+        self._manifest.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_MISSING = object()
+
+
+def _to_builtin(value):
+    # Skalary NumPy (np. koszty z tablic generate_cost_tensor) nie są serializowalne do JSON
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Nie można zapisać wartości typu {type(value).__name__}")
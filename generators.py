@@ -1,5 +1,7 @@
 import random
 
+import numpy as np
+
 
 def generate_cost_matrix(num_tasks, num_resources):
     """
@@ -28,4 +30,66 @@ def generate_processing_times(num_tasks):
     list[int]: Lista czasów przetwarzania dla każdego zadania.
                Długość listy równa jest liczbie zadań (num_tasks).
     """
-    return [random.randint(1, 10) for _ in range(num_tasks)]
\ No newline at end of file
+    return [random.randint(1, 10) for _ in range(num_tasks)]
+
+
+def generate_cost_tensor(trials, num_tasks, num_resources, rng=None, distribution='uniform', low=1, high=10,
+                         alpha=2.0, correlation=0.5, dtype=np.int64):
+    """
+    Generuje macierze kosztów dla wielu prób jednym wektorowym wywołaniem.
+
+    Parametry:
+    trials (int): Liczba prób (instancji).
+    num_tasks (int): Liczba zadań do przypisania.
+    num_resources (int): Liczba dostępnych zasobów.
+    rng (numpy.random.Generator | int | None): Generator liczb losowych lub ziarno.
+    distribution (str): 'uniform' - koszty całkowite z przedziału [low, high],
+                        'heavy_tailed' - koszty o rozkładzie Pareto z parametrem alpha, nie mniejsze niż low,
+                        'correlated' - koszt zależny od wspólnego składnika zadania i zasobu w proporcji correlation.
+    low (int), high (int): Zakres kosztów (dla 'heavy_tailed' tylko dolna granica).
+    alpha (float): Parametr kształtu rozkładu Pareto.
+    correlation (float): Udział składnika zadanie/zasób w koszcie dla rozkładu 'correlated' (0 - 1).
+    dtype: Typ całkowity wyniku (np. np.int32 dla dużych partii).
+
+    Zwraca:
+    numpy.ndarray: Tablica o wymiarach trials x num_tasks x num_resources.
+    """
+    rng = np.random.default_rng(rng)
+    shape = (trials, num_tasks, num_resources)
+    if distribution == 'uniform':
+        return rng.integers(low, high + 1, size=shape, dtype=dtype)
+    if distribution == 'heavy_tailed':
+        return np.ceil(low * (1 + rng.pareto(alpha, size=shape))).astype(dtype)
+    if distribution == 'correlated':
+        task_factor = rng.uniform(low, high, size=(trials, num_tasks, 1))
+        resource_factor = rng.uniform(low, high, size=(trials, 1, num_resources))
+        noise = rng.uniform(low, high, size=shape)
+        costs = correlation * (task_factor + resource_factor) / 2 + (1 - correlation) * noise
+        return np.rint(costs).astype(dtype)
+    raise ValueError(f"Nieznany rozkład: {distribution}")
+
+
+def generate_processing_times_batch(trials, num_tasks, rng=None, distribution='uniform', low=1, high=10,
+                                    alpha=2.0, dtype=np.int64):
+    """
+    Generuje czasy przetwarzania zadań dla wielu prób jednym wektorowym wywołaniem.
+
+    Parametry:
+    trials (int): Liczba prób (instancji).
+    num_tasks (int): Liczba zadań.
+    rng (numpy.random.Generator | int | None): Generator liczb losowych lub ziarno.
+    distribution (str): 'uniform' lub 'heavy_tailed' (jak w generate_cost_tensor).
+    low (int), high (int): Zakres czasów przetwarzania (dla 'heavy_tailed' tylko dolna granica).
+    alpha (float): Parametr kształtu rozkładu Pareto.
+    dtype: Typ całkowity wyniku.
+
+    Zwraca:
+    numpy.ndarray: Tablica o wymiarach trials x num_tasks.
+    """
+    rng = np.random.default_rng(rng)
+    shape = (trials, num_tasks)
+    if distribution == 'uniform':
+        return rng.integers(low, high + 1, size=shape, dtype=dtype)
+    if distribution == 'heavy_tailed':
+        return np.ceil(low * (1 + rng.pareto(alpha, size=shape))).astype(dtype)
+    raise ValueError(f"Nieznany rozkład: {distribution}")
@@ -0,0 +1,165 @@
+import time
+
+import numpy as np
+
+from bounds import optimality_gap
+from clourd_resource import CloudResourceAllocation
+from sparse import SparseCostMatrix
+
+
+def _encoding(cost_matrix, processing_times):
+    """
+    Kodowanie genotypu wspólne dla macierzy gęstej i rzadkiej.
+
+    Gen zadania t to pozycja w spłaszczonej tablicy dopuszczalnych par (w zakresie indptr[t]..indptr[t + 1]),
+    więc przystosowanie całej populacji to jeden odczyt weights[population], a mutacja losuje wyłącznie
+    dopuszczalne zasoby. Za ostatnią parą znajduje się dodatkowa pozycja indptr[-1] (zasób -1, koszt 0) -
+    gen zadań bez dopuszczalnych zasobów, które pozostają nieprzypisane.
+
+    Zwraca:
+    tuple: (indptr, resources, weights) - początki wierszy, zasób każdej pary i jej koszt ważony
+           processing_times[t] * cost_matrix[t][r].
+    """
+    times = np.asarray(processing_times, dtype=float)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        indptr = cost_matrix.indptr
+        resources, weights = cost_matrix.indices, cost_matrix.data * np.repeat(times, np.diff(indptr))
+    else:
+        costs = np.asarray(cost_matrix, dtype=float)
+        num_tasks, num_resources = costs.shape
+        indptr = np.arange(0, num_tasks * num_resources + 1, num_resources, dtype=np.int64) if num_resources \
+            else np.zeros(num_tasks + 1, dtype=np.int64)
+        resources, weights = np.tile(np.arange(num_resources, dtype=np.int32), num_tasks), (costs * times[:, None]).ravel()
+    return indptr, np.append(resources, -1).astype(np.int32), np.append(weights, 0.0)
+
+
+def _random_genes(rng, indptr, tasks):
+    # Pozycja losowej dopuszczalnej pary każdego z zadań tasks (wiersz bez dopuszczalnych par daje indptr[-1])
+    widths = indptr[tasks + 1] - indptr[tasks]
+    genes = indptr[tasks] + (rng.random(np.shape(tasks)) * widths).astype(np.int64)
+    return np.where(widths > 0, genes, indptr[-1])
+
+
+def genetic_optimization(system, population_size=100, generations=200, mutation_rate=0.02, elite=2, tournament=3,
+                         capacities=None, penalty=None, local_search=None, time_limit=None, rng=None, tolerance=None):
+    """
+    Algorytm genetyczny (memetyczny) na populacji przypisań przechowywanej jako tablica NumPy (P x T).
+
+    W każdym pokoleniu przystosowanie całej populacji liczone jest jednym wektorowym odczytem kosztów,
+    a selekcja turniejowa, krzyżowanie równomierne i mutacja wykonywane są dla całej populacji naraz.
+    Najlepsze osobniki (elite) przechodzą do następnego pokolenia bez zmian i opcjonalnie są poprawiane
+    przeszukiwaniem lokalnym.
+
+    Parametry:
+    system (CloudResourceAllocation): Alokacja, której przypisanie zostaje zastąpione najlepszym osobnikiem.
+    population_size (int): Liczba osobników P.
+    generations (int): Liczba pokoleń.
+    mutation_rate (float): Prawdopodobieństwo mutacji pojedynczego genu.
+    elite (int): Liczba najlepszych osobników przenoszonych bez zmian.
+    tournament (int): Rozmiar turnieju selekcji.
+    capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie; przekroczenia są karane.
+    penalty (float | None): Kara za każde zadanie ponad pojemność (domyślnie suma największych kosztów zadań).
+    local_search (str | None): Metoda CloudResourceAllocation (np. 'minimize_gelr') stosowana do elity w każdym
+                               pokoleniu; poprawiony osobnik zastępuje osobnika elity tylko wtedy, gdy jego
+                               przystosowanie (z karą za pojemności) nie jest gorsze.
+    time_limit (float | None): Limit czasu w sekundach.
+    rng (numpy.random.Generator | int | None): Generator liczb losowych lub ziarno.
+    tolerance (float | None): Dopuszczalna luka optymalności względem system.lower_bound(capacities);
+                              przy podanej algorytm kończy się, gdy najlepszy osobnik bez przekroczeń
+                              pojemności ją osiągnie. Luka wyniku zapisywana jest w system.gaps.
+
+    Zwraca:
+    tuple[float, list[float]]: Koszt całkowity najlepszego osobnika i najlepsze przystosowanie w każdym pokoleniu.
+    """
+    rng = np.random.default_rng(rng)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    indptr, resources, weights = _encoding(system.cost_matrix, system.processing_times)
+    num_tasks = system.num_tasks
+    elite = min(elite, population_size)
+    if capacities is not None:
+        capacities = np.asarray(capacities, dtype=np.int64)
+        if penalty is None:
+            penalty = float(np.maximum.reduceat(weights, indptr[:-1][np.diff(indptr) > 0]).sum()) + 1.0 \
+                if indptr[-1] else 1.0
+    rows = np.arange(population_size)[:, None]
+    # Klucze t * R + r par są rosnące (wiersze kolejno, zasoby w wierszu posortowane), więc pozycję genu
+    # dla zasobu r zadania t daje jedno wyszukiwanie binarne
+    keys = np.repeat(np.arange(num_tasks, dtype=np.int64), np.diff(indptr)) * system.num_resources + resources[:-1]
+    tasks = np.arange(num_tasks, dtype=np.int64)
+
+    def genes_of(assignment):
+        # Zasób spoza dopuszczalnych par zadania (także -1) daje gen indptr[-1]
+        assignment = np.asarray(assignment, dtype=np.int64)
+        wanted = tasks * system.num_resources + assignment
+        genes = np.searchsorted(keys, wanted)
+        found = (assignment >= 0) & (genes < len(keys)) & (np.append(keys, -1)[genes] == wanted)
+        return np.where(found, genes, indptr[-1])
+
+    def overload(population):
+        # Liczba zadań na każdym zasobie dla wszystkich osobników jednym wywołaniem bincount
+        # (geny zadań nieprzypisanych, z zasobem -1, nie są liczone)
+        assigned = resources[population]
+        counts = np.bincount((rows[:len(population)] * system.num_resources + assigned)[assigned >= 0],
+                             minlength=len(population) * system.num_resources)
+        return np.maximum(counts.reshape(len(population), -1) - capacities, 0).sum(axis=1)
+
+    def fitness(population):
+        values = weights[population].sum(axis=1)
+        if capacities is not None:
+            values = values + penalty * overload(population)
+        return values
+
+    # Koszt, przy którym luka względem dolnego ograniczenia nie przekracza tolerance
+    target = system._gap_target(tolerance, capacities)
+
+    def reached(population, scores):
+        if target is None:
+            return False
+        best = int(np.argmin(scores))
+        feasible = capacities is None or overload(population[best:best + 1])[0] == 0
+        return feasible and optimality_gap(float(scores[best]), target) == 0
+
+    def improve(genes):
+        # Przeszukiwanie lokalne osobnika na CloudResourceAllocation współdzielącej macierz kosztów
+        member = CloudResourceAllocation(num_tasks, system.num_resources, system.cost_matrix, system.processing_times)
+        member.set_assignment(resources[genes].tolist())
+        getattr(member, local_search)()
+        return genes_of(member.assignment)
+
+    population = _random_genes(rng, indptr, np.broadcast_to(np.arange(num_tasks), (population_size, num_tasks)))
+    initial = genes_of(system.assignment)
+    if num_tasks and np.all((initial != indptr[-1]) | (np.diff(indptr) == 0)):
+        # Bieżące przypisanie (jeśli przypisuje każde zadanie z dopuszczalnymi zasobami) jest jednym
+        # z osobników populacji początkowej
+        population[0] = initial
+    scores = fitness(population)
+    history = []
+
+    for _ in range(generations):
+        if (deadline is not None and time.perf_counter() >= deadline) or reached(population, scores):
+            break
+        order = np.argsort(scores, kind='stable')
+        elites = population[order[:elite]].copy()
+        if local_search is not None and elite:
+            # Przeszukiwanie lokalne nie musi uwzględniać pojemności - wynik gorszy od osobnika jest odrzucany
+            improved = np.array([improve(genes) for genes in elites])
+            kept = fitness(improved) <= scores[order[:elite]]
+            elites[kept] = improved[kept]
+
+        # Selekcja turniejowa: dla każdego rodzica zwycięzca spośród tournament losowych osobników
+        contestants = rng.integers(0, population_size, size=(2, population_size - elite, tournament))
+        winners = np.take_along_axis(contestants, np.argmin(scores[contestants], axis=2)[..., None], axis=2)[..., 0]
+        mothers, fathers = population[winners[0]], population[winners[1]]
+        # Krzyżowanie równomierne i mutacja całej populacji potomków
+        children = np.where(rng.random(mothers.shape) < 0.5, mothers, fathers)
+        mutated, mutated_tasks = np.nonzero(rng.random(children.shape) < mutation_rate)
+        children[mutated, mutated_tasks] = _random_genes(rng, indptr, mutated_tasks)
+
+        population = np.concatenate([elites, children])
+        scores = fitness(population)
+        history.append(float(scores.min()))
+
+    best = population[int(np.argmin(scores))]
+    system.set_assignment(resources[best].tolist())
+    system._record_gap('genetic_optimization', tolerance, capacities)
+    return system.calculate_total_cost(), history
@@ -0,0 +1,146 @@
+from array import array
+
+import numpy as np
+
+from nash import utility_matrix
+from sparse import SparseCostMatrix
+
+
+class Instance:
+    """
+    Niezmienna instancja problemu współdzielona przez wiele rozwiązań i metod.
+
+    Przy utworzeniu wyznaczane są raz tylko do odczytu: koszty ważone processing_times[i] * cost_matrix[i][j]
+    oraz zasoby każdego zadania posortowane rosnąco według kosztu cost_matrix[i][j] (przy równych kosztach
+    według indeksu, jak w GlobalCostState) wraz z dwoma najtańszymi zasobami każdego zadania.
+    Dla macierzy rzadkiej obie tablice są wyrównane z tablicami CSR (indptr / indices), a dla gęstej
+    mają wymiary num_tasks x num_resources. Macierz użyteczności (nash.utility_matrix) budowana jest
+    przy pierwszym użyciu i współdzielona przez wszystkie alokacje instancji.
+    """
+    __slots__ = ('num_tasks', 'num_resources', 'cost_matrix', 'processing_times', 'sparse', 'indptr', 'weights',
+                 'resource_order', 'best', 'second', '_utilities', '_frozen')
+
+    def __init__(self, cost_matrix, processing_times):
+        times = np.asarray(processing_times, dtype=float)
+        self.cost_matrix = cost_matrix
+        self.processing_times = processing_times
+        self.num_tasks = len(times)
+        self.sparse = isinstance(cost_matrix, SparseCostMatrix)
+        if self.sparse:
+            self.num_resources = cost_matrix.num_resources
+            self.indptr = cost_matrix.indptr
+            rows = np.repeat(np.arange(self.num_tasks), np.diff(self.indptr))
+            self.weights = cost_matrix.data * times[rows]
+            # Jedno sortowanie wszystkich par: wiersz, koszt, zasób
+            order = np.lexsort((cost_matrix.indices, cost_matrix.data, rows))
+            self.resource_order = cost_matrix.indices[order]
+        else:
+            costs = np.asarray(cost_matrix, dtype=float).reshape(self.num_tasks, -1)
+            self.num_resources = costs.shape[1]
+            self.indptr = None
+            self.weights = costs * times[:, None]
+            # Kolejność według kosztu, a nie kosztu ważonego - przy zerowym czasie przetwarzania byłyby różne
+            self.resource_order = np.argsort(costs, axis=1, kind='stable').astype(np.int32)
+        self.weights.flags.writeable = False
+        self.resource_order.flags.writeable = False
+        # Dwa najtańsze zasoby każdego zadania (-1, gdy zadanie ma ich mniej) dla GlobalCostState
+        self.best = array('i', [-1] * self.num_tasks)
+        self.second = array('i', [-1] * self.num_tasks)
+        for task in range(self.num_tasks):
+            ranked = self.ranked_resources(task)
+            if len(ranked) > 0:
+                self.best[task] = int(ranked[0])
+            if len(ranked) > 1:
+                self.second[task] = int(ranked[1])
+        self._utilities = None
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("Instance jest niezmienna")
+        object.__setattr__(self, name, value)
+
+    def weight(self, task, resource):
+        """
+        Koszt ważony przypisania zadania task do zasobu resource (inf dla niedopuszczalnej pary).
+        """
+        if self.sparse:
+            return self.cost_matrix[task][resource] * self.processing_times[task]
+        return float(self.weights[task, resource])
+
+    def utility_matrix(self):
+        """
+        Macierz użyteczności instancji (nash.utility_matrix), wyznaczana raz i współdzielona.
+        """
+        if self._utilities is None:
+            # Jedyny leniwie wyznaczany atrybut - niezmienność dotyczy wartości, nie chwili ich obliczenia
+            object.__setattr__(self, '_utilities', utility_matrix(self.cost_matrix, self.processing_times))
+        return self._utilities
+
+    def ranked_resources(self, task):
+        """
+        Zasoby zadania task posortowane rosnąco według kosztu.
+        """
+        if self.sparse:
+            return self.resource_order[self.indptr[task]:self.indptr[task + 1]]
+        return self.resource_order[task]
+
+    def task_weights(self, assignment):
+        """
+        Koszt ważony każdego zadania przy przypisaniu assignment jednym wektorowym odczytem (0 dla zadań z -1).
+        """
+        assignment = np.frombuffer(assignment, dtype=np.int32) if isinstance(assignment, array) \
+            else np.asarray(assignment, dtype=np.int64)
+        weights = np.zeros(self.num_tasks)
+        tasks = np.flatnonzero(assignment >= 0)
+        if self.sparse:
+            weights[tasks] = [self.weight(task, int(assignment[task])) for task in tasks]
+        else:
+            weights[tasks] = self.weights[tasks, assignment[tasks]]
+        return weights
+
+    def total_cost(self, assignment):
+        """
+        Koszt całkowity przypisania (zadania z -1 są pomijane).
+        """
+        return float(self.task_weights(assignment).sum())
+
+    def solution(self, assignment=None):
+        """
+        Nowe rozwiązanie tej instancji (domyślnie z nieprzypisanymi zadaniami).
+        """
+        return Solution(self, array('i', assignment) if assignment is not None else array('i', [-1] * self.num_tasks))
+
+
+class Solution:
+    """
+    Lekkie rozwiązanie instancji: wektor przypisań i zapamiętany koszt całkowity.
+    Kopia kosztuje O(T) i nie kopiuje niczego z instancji.
+    """
+    __slots__ = ('instance', 'assignment', '_total_cost')
+
+    def __init__(self, instance, assignment, total_cost=None):
+        self.instance = instance
+        self.assignment = assignment
+        self._total_cost = total_cost
+
+    @property
+    def total_cost(self):
+        if self._total_cost is None:
+            self._total_cost = self.instance.total_cost(self.assignment)
+        return self._total_cost
+
+    def move(self, task, resource):
+        """
+        Przenosi zadanie na zasób resource, aktualizując zapamiętany koszt w czasie O(1).
+        """
+        old = self.assignment[task]
+        if self._total_cost is not None:
+            if old >= 0:
+                self._total_cost -= self.instance.weight(task, old)
+            if resource >= 0:
+                self._total_cost += self.instance.weight(task, resource)
+        self.assignment[task] = resource
+
+    def copy(self):
+        return Solution(self.instance, array('i', self.assignment), self._total_cost)
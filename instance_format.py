@@ -0,0 +1,137 @@
+import struct
+
+import numpy as np
+
+from sparse import SparseCostMatrix
+
+INSTANCE_MAGIC = b'CRAINST\x00'
+SOLUTION_MAGIC = b'CRASOL\x00\x00'
+VERSION = 1
+FLAG_SPARSE = 1
+# Nagłówek o stałym rozmiarze (little-endian), po nim surowe tablice wyrównane do ALIGNMENT bajtów
+HEADER_SIZE = 128
+ALIGNMENT = 64
+
+_INSTANCE_HEADER = struct.Struct('<8sIIqqq8s8sqqqq')
+_SOLUTION_HEADER = struct.Struct('<8sIIqdq')
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _write_arrays(file, arrays):
+    """
+    Zapisuje tablice po nagłówku z wyrównaniem; zwraca ich przesunięcia (0 dla brakujących tablic).
+    """
+    offsets = []
+    position = HEADER_SIZE
+    for array in arrays:
+        if array is None:
+            offsets.append(0)
+            continue
+        position = _aligned(position)
+        file.seek(position)
+        array.tofile(file)
+        offsets.append(position)
+        position += array.nbytes
+    return offsets
+
+
+def save_instance(filename, cost_matrix, processing_times):
+    """
+    Zapisuje instancję do pliku binarnego.
+
+    Nagłówek zawiera magic, wersję, flagi, num_tasks, num_resources, nnz, typy danych kosztów i czasów
+    przetwarzania oraz przesunięcia tablic: kosztów (gęsta macierz num_tasks x num_resources lub tablica data
+    formatu CSR), indptr, indices (tylko dla instancji z dopuszczalnością, FLAG_SPARSE) i processing_times.
+
+    Parametry:
+    filename (str): Ścieżka pliku.
+    cost_matrix (list[list] | numpy.ndarray | SparseCostMatrix): Macierz kosztów; macierz rzadka zapisywana
+                                                                  jest w formacie CSR wraz z dopuszczalnością.
+    processing_times (list | numpy.ndarray): Czasy przetwarzania zadań.
+    """
+    times = np.ascontiguousarray(processing_times)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        flags = FLAG_SPARSE
+        num_tasks, num_resources, nnz = len(cost_matrix), cost_matrix.num_resources, cost_matrix.nnz
+        costs = np.ascontiguousarray(cost_matrix.data)
+        indptr = np.ascontiguousarray(cost_matrix.indptr, dtype=np.int64)
+        indices = np.ascontiguousarray(cost_matrix.indices, dtype=np.int32)
+    else:
+        flags = 0
+        costs = np.ascontiguousarray(cost_matrix)
+        if costs.size == 0 and costs.ndim < 2:
+            # Pusta lista list nie zachowuje wymiarów - instancja bez zadań i zasobów
+            costs = costs.reshape(0, 0)
+        num_tasks, num_resources = costs.shape
+        nnz = costs.size
+        indptr = indices = None
+
+    with open(filename, mode='wb') as file:
+        file.write(b'\x00' * HEADER_SIZE)
+        offsets = _write_arrays(file, [costs, indptr, indices, times])
+        file.seek(0)
+        file.write(_INSTANCE_HEADER.pack(INSTANCE_MAGIC, VERSION, flags, num_tasks, num_resources, nnz,
+                                         costs.dtype.str.encode(), times.dtype.str.encode(), *offsets))
+
+
+def load_instance(filename):
+    """
+    Otwiera instancję zapisaną przez save_instance przez numpy.memmap (tylko do odczytu, bez kopiowania),
+    więc wiele procesów czytających ten sam plik współdzieli strony pamięci.
+
+    Zwraca:
+    tuple: (num_tasks, num_resources, cost_matrix, processing_times), gdzie cost_matrix to numpy.memmap
+           lub SparseCostMatrix zbudowana na tablicach numpy.memmap.
+    """
+    with open(filename, mode='rb') as file:
+        header = file.read(_INSTANCE_HEADER.size)
+    (magic, version, flags, num_tasks, num_resources, nnz, cost_dtype, time_dtype,
+     costs_offset, indptr_offset, indices_offset, times_offset) = _INSTANCE_HEADER.unpack(header)
+    if magic != INSTANCE_MAGIC or version != VERSION:
+        raise ValueError(f"Plik '{filename}' nie jest plikiem instancji w wersji {VERSION}")
+    cost_dtype = np.dtype(cost_dtype.rstrip(b'\x00').decode())
+    time_dtype = np.dtype(time_dtype.rstrip(b'\x00').decode())
+
+    processing_times = np.memmap(filename, dtype=time_dtype, mode='r', offset=times_offset, shape=(num_tasks,))
+    if flags & FLAG_SPARSE:
+        data = np.memmap(filename, dtype=cost_dtype, mode='r', offset=costs_offset, shape=(nnz,))
+        indptr = np.memmap(filename, dtype=np.int64, mode='r', offset=indptr_offset, shape=(num_tasks + 1,))
+        indices = np.memmap(filename, dtype=np.int32, mode='r', offset=indices_offset, shape=(nnz,))
+        cost_matrix = SparseCostMatrix(num_resources, indptr, indices, data)
+    else:
+        cost_matrix = np.memmap(filename, dtype=cost_dtype, mode='r', offset=costs_offset,
+                                shape=(num_tasks, num_resources))
+    return num_tasks, num_resources, cost_matrix, processing_times
+
+
+def save_solution(filename, assignment, total_cost):
+    """
+    Zapisuje rozwiązanie (wektor przypisań i koszt całkowity) do pliku binarnego.
+
+    Nagłówek zawiera magic, wersję, num_tasks, koszt całkowity i przesunięcie wektora przypisań (int32, -1 = brak).
+    """
+    assignment = np.ascontiguousarray(assignment, dtype=np.int32)
+    with open(filename, mode='wb') as file:
+        file.write(b'\x00' * HEADER_SIZE)
+        offset, = _write_arrays(file, [assignment])
+        file.seek(0)
+        file.write(_SOLUTION_HEADER.pack(SOLUTION_MAGIC, VERSION, 0, len(assignment), float(total_cost), offset))
+
+
+def load_solution(filename):
+    """
+    Otwiera rozwiązanie zapisane przez save_solution.
+
+    Zwraca:
+    tuple: (assignment, total_cost), gdzie assignment to numpy.memmap typu int32.
+    """
+    with open(filename, mode='rb') as file:
+        header = file.read(_SOLUTION_HEADER.size)
+    magic, version, _, num_tasks, total_cost, offset = _SOLUTION_HEADER.unpack(header)
+    if magic != SOLUTION_MAGIC or version != VERSION:
+        raise ValueError(f"Plik '{filename}' nie jest plikiem rozwiązania w wersji {VERSION}")
+    assignment = np.memmap(filename, dtype=np.int32, mode='r', offset=offset, shape=(num_tasks,))
+    return assignment, total_cost
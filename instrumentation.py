@@ -0,0 +1,92 @@
+import functools
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+HEADERS = ["Kind", "Name", "Calls", "Wall Time", "CPU Time", "Value"]
+
+
+class Instrumentation:
+    """
+    Pomiary czasu faz optymalizacji (czas rzeczywisty i procesora) oraz liczniki zdarzeń,
+    np. liczby obliczeń kosztu, użyteczności, realokacji i przebiegów.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.timers = defaultdict(lambda: {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mierzy czas wykonania bloku i dolicza go do fazy name.
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            timer = self.timers[name]
+            timer['calls'] += 1
+            timer['wall'] += time.perf_counter() - wall_start
+            timer['cpu'] += time.process_time() - cpu_start
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+
+    def to_dict(self):
+        return {'phases': {name: dict(timer) for name, timer in self.timers.items()},
+                'counters': dict(self.counters)}
+
+    def to_rows(self):
+        """
+        Zwraca nagłówki i wiersze w formacie zgodnym z files.save_results_to_csv.
+        """
+        rows = [["phase", name, timer['calls'], timer['wall'], timer['cpu'], ""]
+                for name, timer in self.timers.items()]
+        rows += [["counter", name, "", "", "", value] for name, value in self.counters.items()]
+        return HEADERS, rows
+
+
+class NullInstrumentation:
+    """
+    Wyłączone pomiary - wszystkie operacje są pustymi wywołaniami.
+    """
+    enabled = False
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def count(self, name, amount=1):
+        pass
+
+    def reset(self):
+        pass
+
+    def to_dict(self):
+        return {'phases': {}, 'counters': {}}
+
+    def to_rows(self):
+        return HEADERS, []
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def timed_phase(name):
+    """
+    Dekorator metod CloudResourceAllocation mierzący czas fazy name w self.instrumentation.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
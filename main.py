@@ -1,13 +1,50 @@
 from clourd_resource import CloudResourceAllocation
 from compares import compare_initialization_methods, compare_tasks_resources, compare_different_number_of_resources, \
     compare_brute_force_performance
-from files import save_results_to_csv
+from files import StreamingResultWriter, save_results_to_csv, save_results_to_json
 from generators import generate_cost_matrix, generate_processing_times
+from instrumentation import Instrumentation
+from reports import render_reports
+import argparse
+import logging
+import os
+import random
 import time
 
+
+def _timed_experiment(sink, experiment, *args, **kwargs):
+    """
+    Uruchamia eksperyment i zwraca jego wynik oraz czas wykonania - None, jeśli część prób odtworzono
+    z manifestu, bo czas nie obejmowałby wtedy ich obliczeń.
+    """
+    replayed = sink.replayed
+    start_time = time.time()
+    result = experiment(*args, sink=sink, **kwargs)
+    execution_time = time.time() - start_time
+    return result, execution_time if sink.replayed == replayed else None
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Eksperymenty alokacji zadań do zasobów")
+    parser.add_argument('--seed', type=int, help="Ziarno główne eksperymentów (domyślnie losowe)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Pomiń próby zapisane już dla tego ziarna w 'wyniki_prob_<ziarno>.csv'")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Liczba procesów wykonujących próby")
+    args = parser.parse_args()
+
+    # Komunikaty o pojedynczych realokacjach są na poziomie DEBUG
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     num_tasks = 5
     num_resources = 5
+    master_seed = args.seed if args.seed is not None else random.getrandbits(32)
+    workers = args.workers
+    # Wyniki prób każdego ziarna trafiają do osobnego pliku; bez --resume zaczynamy od pustego pliku
+    results_filename = f"wyniki_prob_{master_seed}.csv"
+    if not args.resume:
+        for filename in (results_filename, f"{results_filename}.manifest.jsonl"):
+            if os.path.exists(filename):
+                os.remove(filename)
+    print(f"Ziarno główne: {master_seed}")
 
     # Zapis wyników do pliku CSV
     headers = ["Approach", "Execution Time", "Initial Cost", "Final Cost"]
@@ -20,7 +57,9 @@ if __name__ == '__main__':
 
     # Utworzenie instancji klasy i uruchomienie procesu optymalizacji
     start_time = time.time()
-    allocation_system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    instrumentation = Instrumentation()
+    allocation_system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times,
+                                                instrumentation=instrumentation)
     allocation_system.random_initialization()
     allocation_system.initial_optimization()
     allocation_system.minimize_splr()
@@ -30,35 +69,47 @@ if __name__ == '__main__':
     initial_cost = allocation_system.calculate_total_cost()
 
     print("\nComparison of Initialization Methods:")
-    compare_initialization_methods(num_tasks, num_resources)
+    # Surowe wyniki etapu obliczeń - wykresy generowane są na końcu jednym przebiegiem
+    raw_results = {}
+    # Plik prób zamykany jest także po wyjątku, więc zapisane wyniki pozostają kompletne
+    with StreamingResultWriter(results_filename) as sink:
+        raw_results['initialization_methods'] = list(compare_initialization_methods(
+            num_tasks, num_resources, master_seed=master_seed, workers=workers, sink=sink))
 
-    final_cost = allocation_system.calculate_total_cost()
-    data.append(["Comparison of Initialization Methods", execution_time, initial_cost, final_cost])
+        final_cost = allocation_system.calculate_total_cost()
+        data.append(["Comparison of Initialization Methods", execution_time, initial_cost, final_cost])
 
-    # Porównanie wyników dla różnej liczby zadań
-    start_time = time.time()
-    tasks_costs, resources_costs = compare_tasks_resources(10, 10)
-    execution_time = time.time() - start_time
+        # Porównanie wyników dla różnej liczby zadań
+        (tasks_costs, resources_costs), execution_time = _timed_experiment(
+            sink, compare_tasks_resources, 10, 10, master_seed=master_seed, workers=workers)
 
-    data.append(
-        ["Comparison of Results for Different Number of Tasks", execution_time, tasks_costs[-1], resources_costs[-1]])
+        data.append(["Comparison of Results for Different Number of Tasks", execution_time, tasks_costs[-1],
+                     resources_costs[-1]])
 
-    # Porównanie wyników dla różnej liczby zasobów
-    start_time = time.time()
-    resources_costs_initial, resources_costs_final = compare_different_number_of_resources(num_tasks, 10)
-    execution_time = time.time() - start_time
+        # Porównanie wyników dla różnej liczby zasobów
+        (resources_costs_initial, resources_costs_final), execution_time = _timed_experiment(
+            sink, compare_different_number_of_resources, num_tasks, 10, master_seed=master_seed, workers=workers)
 
-    data.append(["Comparison of Results for Different Number of Resources", execution_time, resources_costs_initial[-1],
-                 resources_costs_final[-1]])
+        data.append(["Comparison of Results for Different Number of Resources", execution_time,
+                     resources_costs_initial[-1], resources_costs_final[-1]])
 
-    # Porównanie oceny wydajności podejścia brute force
-    start_time = time.time()
-    optimized_cost, brute_force_cost = compare_brute_force_performance(num_tasks, num_resources)
-    execution_time = time.time() - start_time
+        # Porównanie oceny wydajności podejścia brute force
+        (optimized_costs, brute_force_costs), execution_time = _timed_experiment(
+            sink, compare_brute_force_performance, num_tasks, num_resources, master_seed=master_seed,
+            workers=workers)
+    raw_results['brute_force_performance'] = [optimized_costs, brute_force_costs]
+    optimized_cost = sum(optimized_costs) / len(optimized_costs)
+    brute_force_cost = sum(brute_force_costs) / len(brute_force_costs)
 
     data.append(["Brute Force Approach", execution_time, brute_force_cost, optimized_cost])
 
     # Zapisz dane do pliku CSV
     save_results_to_csv("wyniki_testow.csv", headers, data)
+    # Zapisz pomiary faz i liczniki
+    save_results_to_csv("metryki_faz.csv", *instrumentation.to_rows())
+    save_results_to_json("metryki_faz.json", instrumentation.to_dict())
+    # Zapisz surowe wyniki i wygeneruj z nich wykresy (ponownie: python reports.py wyniki_surowe.json)
+    save_results_to_json("wyniki_surowe.json", raw_results)
+    render_reports(raw_results)
 
     print("Results of experiments have been saved to 'wyniki_testow.csv'")
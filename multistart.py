@@ -0,0 +1,167 @@
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bounds import optimality_gap, row_minimum_bound
+from clourd_resource import CloudResourceAllocation
+from experiments import derive_seed
+from sparse import SparseCostMatrix
+
+# Domyślny łańcuch przeszukiwania lokalnego uruchamiany z każdego startu
+PIPELINE = ('minimize_splr', 'minimize_gelr', 'evolutionary_optimization')
+
+# Instancja widoczna w procesie roboczym (ustawiana w _attach_instance)
+_instance = None
+_segments = []
+
+
+def _share(array_like, dtype):
+    """
+    Kopiuje tablicę do nowego segmentu pamięci współdzielonej; zwraca segment i jego opis dla procesów roboczych.
+    """
+    source = np.ascontiguousarray(array_like, dtype=dtype)
+    segment = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+    np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)[...] = source
+    return segment, (segment.name, source.dtype.str, source.shape)
+
+
+def _view(description):
+    """
+    Dołącza segment pamięci współdzielonej i zwraca tablicę NumPy na jego buforze (bez kopiowania).
+    """
+    name, dtype, shape = description
+    segment = shared_memory.SharedMemory(name=name)
+    _segments.append(segment)  # Segment musi pozostać otwarty, dopóki istnieje widok
+    return np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _attach_instance(descriptions, num_resources):
+    global _instance
+    processing_times = _view(descriptions['processing_times'])
+    if 'data' in descriptions:
+        cost_matrix = SparseCostMatrix(num_resources, _view(descriptions['indptr']), _view(descriptions['indices']),
+                                       _view(descriptions['data']))
+    else:
+        cost_matrix = _view(descriptions['cost_matrix'])
+    _instance = (cost_matrix, processing_times)
+
+
+def _run_start(seed, pipeline, time_limit, tolerance=None):
+    """
+    Pojedynczy start: losowa inicjalizacja z ziarnem seed i łańcuch przeszukiwania lokalnego pipeline
+    (przy podanej tolerance każda metoda kończy się po osiągnięciu dopuszczalnej luki optymalności).
+    Zwraca koszt całkowity i wektor przypisań.
+    """
+    cost_matrix, processing_times = _instance
+    system = CloudResourceAllocation(len(cost_matrix), _num_resources(cost_matrix), cost_matrix, processing_times)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        system.random_initialization()
+        for phase in pipeline:
+            params = {'tolerance': tolerance} if tolerance is not None else {}
+            if phase == 'evolutionary_optimization':
+                system.evolutionary_optimization(time_limit=time_limit, **params)
+            else:
+                getattr(system, phase)(**params)
+    finally:
+        random.setstate(state)
+    return float(system.calculate_total_cost()), system.assignment
+
+
+def _num_resources(cost_matrix):
+    if isinstance(cost_matrix, SparseCostMatrix):
+        return cost_matrix.num_resources
+    return cost_matrix.shape[1]
+
+
+def multi_start(cost_matrix, processing_times, starts=8, workers=None, master_seed=None, pipeline=PIPELINE,
+                time_limit=None, tolerance=None):
+    """
+    Wielostartowe przeszukiwanie lokalne: starts niezależnych startów z losowej inicjalizacji,
+    każdy z własnym ziarnem, rozwiązywanych równolegle w puli procesów.
+
+    Instancja jest kopiowana raz do pamięci współdzielonej (multiprocessing.shared_memory), a procesy robocze
+    czytają ją bez kopiowania - do procesów przekazywane są tylko nazwy segmentów i ziarna startów.
+
+    Parametry:
+    cost_matrix (list[list] | numpy.ndarray | SparseCostMatrix): Macierz kosztów.
+    processing_times (list | numpy.ndarray): Czasy przetwarzania zadań.
+    starts (int): Liczba startów.
+    workers (int | None): Liczba procesów; None lub 1 oznacza wykonanie w bieżącym procesie.
+    master_seed (int | None): Ziarno główne; ziarna startów wyznacza experiments.derive_seed,
+                              więc wyniki nie zależą od liczby procesów.
+    pipeline (tuple[str]): Metody CloudResourceAllocation wykonywane kolejno po losowej inicjalizacji.
+    time_limit (float | None): Limit czasu optymalizacji ewolucyjnej w każdym starcie (s).
+    tolerance (float | None): Dopuszczalna luka optymalności względem bounds.row_minimum_bound; przekazywana
+                              metodom pipeline, a po znalezieniu startu o takiej luce kolejne starty
+                              nie są uruchamiane (ich koszty to None).
+
+    Zwraca:
+    tuple[list[int], float, list[float], float]: Najlepsze przypisanie, jego koszt całkowity, koszty wszystkich
+                                                 startów w kolejności startów i luka optymalności najlepszego
+                                                 przypisania względem bounds.row_minimum_bound.
+    """
+    global _instance
+    if master_seed is None:
+        master_seed = random.getrandbits(64)
+    seeds = [derive_seed(master_seed, ('multi_start', start)) for start in range(starts)]
+
+    if isinstance(cost_matrix, SparseCostMatrix):
+        num_resources = cost_matrix.num_resources
+        arrays = {'indptr': (cost_matrix.indptr, np.int64), 'indices': (cost_matrix.indices, np.int32),
+                  'data': (cost_matrix.data, float)}
+    else:
+        cost_matrix = np.asarray(cost_matrix, dtype=float)
+        num_resources = cost_matrix.shape[1] if cost_matrix.ndim == 2 else 0
+        arrays = {'cost_matrix': (cost_matrix, float)}
+    arrays['processing_times'] = (processing_times, float)
+    bound = row_minimum_bound(cost_matrix, processing_times)
+    # Koszt, przy którym luka względem dolnego ograniczenia nie przekracza tolerance
+    target = bound * (1 + tolerance) if tolerance is not None else None
+
+    def reached(result):
+        return target is not None and optimality_gap(result[0], target) == 0
+
+    results = [None] * starts
+    if workers is None or workers <= 1:
+        previous = _instance
+        _instance = (cost_matrix, np.asarray(processing_times, dtype=float))
+        try:
+            for start, seed in enumerate(seeds):
+                results[start] = _run_start(seed, pipeline, time_limit, tolerance)
+                if reached(results[start]):
+                    break
+        finally:
+            _instance = previous
+    else:
+        segments = []
+        try:
+            descriptions = {}
+            for name, (values, dtype) in arrays.items():
+                segment, descriptions[name] = _share(values, dtype)
+                segments.append(segment)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_instance,
+                                     initargs=(descriptions, num_resources)) as executor:
+                futures = {executor.submit(_run_start, seed, pipeline, time_limit, tolerance): start
+                           for start, seed in enumerate(seeds)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    if reached(results[futures[future]]):
+                        # Starty, które jeszcze się nie rozpoczęły, nie są potrzebne
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    costs = [result[0] if result is not None else None for result in results]
+    finished = [start for start in range(starts) if results[start] is not None]
+    if not finished:
+        return None, None, costs, None
+    best = min(finished, key=costs.__getitem__)
+    return list(results[best][1]), costs[best], costs, optimality_gap(costs[best], bound)
@@ -0,0 +1,159 @@
+import heapq
+
+import numpy as np
+
+from sparse import SparseCostMatrix
+
+
+def utility_matrix(cost_matrix, processing_times):
+    """
+    Oblicza użyteczność każdej pary zadanie-zasób jednym wektorowym przebiegiem.
+
+    Zwraca:
+    numpy.ndarray | SparseCostMatrix: Macierz num_tasks x num_resources, gdzie element [i, r] to użyteczność
+                   zadania i przypisanego do zasobu r, czyli 1 / (processing_times[i] * cost_matrix[i][r]).
+                   Dla macierzy rzadkiej wynik ma tę samą strukturę - pominięte pary mają użyteczność 0.
+    """
+    times = np.asarray(processing_times, dtype=float)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        rows = np.repeat(np.arange(len(cost_matrix)), np.diff(cost_matrix.indptr))
+        with np.errstate(divide='ignore'):
+            data = 1 / (times[rows] * cost_matrix.data)
+        return SparseCostMatrix(cost_matrix.num_resources, cost_matrix.indptr, cost_matrix.indices, data)
+    costs = np.asarray(cost_matrix, dtype=float)
+    with np.errstate(divide='ignore'):
+        return 1 / (times[:, None] * costs)
+
+
+def utility_at(utilities, task, resource):
+    """
+    Użyteczność zadania task na zasobie resource (0 dla resource == -1 i pary niedopuszczalnej).
+    """
+    if resource < 0:
+        return 0.0
+    if isinstance(utilities, SparseCostMatrix):
+        start, end = utilities.indptr[task], utilities.indptr[task + 1]
+        position = start + np.searchsorted(utilities.indices[start:end], resource)
+        if position < end and utilities.indices[position] == resource:
+            return float(utilities.data[position])
+        return 0.0
+    return float(utilities[task, resource])
+
+
+def utility_gain_matrix(utilities, assignment):
+    """
+    Zysk użyteczności każdego zadania z jednostronnej zmiany zasobu.
+
+    Parametry:
+    utilities (numpy.ndarray | SparseCostMatrix): Macierz użyteczności z utility_matrix.
+    assignment (array-like): Indeks zasobu każdego zadania (-1 oznacza brak przypisania).
+
+    Zwraca:
+    numpy.ndarray | SparseCostMatrix: Macierz num_tasks x num_resources, gdzie element [i, r] to różnica
+                   użyteczności zadania i po przeniesieniu do zasobu r i przy obecnym przypisaniu (0 dla bieżącego
+                   zasobu). Dla macierzy rzadkiej zawiera tylko pary dopuszczalne - przeniesienie do zasobu
+                   niedopuszczalnego nigdy nie zwiększa użyteczności.
+    """
+    current = _current_utilities(utilities, assignment)
+    if isinstance(utilities, SparseCostMatrix):
+        rows = np.repeat(np.arange(len(utilities)), np.diff(utilities.indptr))
+        return SparseCostMatrix(utilities.num_resources, utilities.indptr, utilities.indices,
+                                utilities.data - current[rows])
+    return utilities - current[:, None]
+
+
+def _current_utilities(utilities, assignment):
+    """
+    Użyteczność każdego zadania przy obecnym przypisaniu (0 dla zadań nieprzypisanych).
+    """
+    if isinstance(utilities, SparseCostMatrix):
+        return np.array([utility_at(utilities, task, resource) for task, resource in enumerate(assignment)])
+    assignment = np.asarray(assignment, dtype=np.int64)
+    assigned = assignment >= 0
+    current = np.zeros(len(assignment))
+    current[assigned] = utilities[np.flatnonzero(assigned), assignment[assigned]]
+    return current
+
+
+def _best_responses(utilities):
+    """
+    Zasób o największej użyteczności dla każdego zadania i ta użyteczność
+    (dla zadania bez dopuszczalnych zasobów -1 i 0).
+    """
+    if isinstance(utilities, SparseCostMatrix):
+        rows = np.repeat(np.arange(len(utilities)), np.diff(utilities.indptr))
+        # Sortowanie stabilne po wierszu, a w wierszu malejąco po użyteczności - pierwszy element
+        # każdego wiersza jest jego maksimum (przy remisie zasób o najmniejszym indeksie, jak w argmax)
+        order = np.lexsort((-utilities.data, rows))
+        starts = utilities.indptr[:-1]
+        nonempty = np.flatnonzero(np.diff(utilities.indptr) > 0)
+        best_resources = np.full(len(utilities), -1, dtype=np.int64)
+        best_utilities = np.zeros(len(utilities))
+        best_resources[nonempty] = utilities.indices[order[starts[nonempty]]]
+        best_utilities[nonempty] = utilities.data[order[starts[nonempty]]]
+        return best_resources, best_utilities
+    best_resources = np.argmax(utilities, axis=1)
+    return best_resources, utilities[np.arange(len(best_resources)), best_resources]
+
+
+def improving_deviations(gains, tolerance=0.0):
+    """
+    Zwraca wszystkie jednostronne odchylenia poprawiające użyteczność o więcej niż tolerance.
+
+    Zwraca:
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Zadania, zasoby docelowe i zyski,
+    posortowane malejąco według zysku. Puste tablice oznaczają równowagę Nasha.
+    """
+    if isinstance(gains, SparseCostMatrix):
+        rows = np.repeat(np.arange(len(gains)), np.diff(gains.indptr))
+        positions = np.flatnonzero(gains.data > tolerance)
+        tasks, resources, values = rows[positions], gains.indices[positions].astype(np.int64), gains.data[positions]
+    else:
+        tasks, resources = np.nonzero(gains > tolerance)
+        values = gains[tasks, resources]
+    order = np.argsort(-values, kind='stable')
+    return tasks[order], resources[order], values[order]
+
+
+def best_response_dynamics(system, utilities, max_iterations=None, tolerance=0.0):
+    """
+    Dynamika najlepszych odpowiedzi z kolejką priorytetową zadań o największym zysku.
+
+    W każdym kroku zadanie o największym zysku przenoszone jest do swojej najlepszej odpowiedzi
+    przez system.perform_reallocation. Zyski w kolejce są weryfikowane przy zdjęciu z kolejki,
+    więc nieaktualne wpisy są pomijane lub ponownie wstawiane z bieżącym zyskiem.
+
+    Parametry:
+    system (CloudResourceAllocation): Alokacja modyfikowana w miejscu.
+    utilities (numpy.ndarray | SparseCostMatrix): Macierz użyteczności z utility_matrix.
+    max_iterations (int | None): Maksymalna liczba realokacji (None - bez ograniczenia).
+    tolerance (float): Minimalny zysk uznawany za poprawę.
+
+    Zwraca:
+    tuple[int, bool]: Liczba wykonanych realokacji i informacja, czy osiągnięto równowagę.
+    """
+    best_resources, best_utilities = _best_responses(utilities)
+
+    def gain(task):
+        return best_utilities[task] - utility_at(utilities, task, system.assignment[task])
+
+    gains = best_utilities - _current_utilities(utilities, system.assignment)
+    queue = [(-value, task) for task, value in enumerate(gains.tolist()) if value > tolerance]
+    heapq.heapify(queue)
+
+    moves = 0
+    while queue:
+        queued_gain, task = heapq.heappop(queue)
+        current_gain = gain(task)
+        if current_gain <= tolerance:
+            continue
+        if current_gain < -queued_gain:
+            # Wpis nieaktualny - wraca do kolejki z bieżącym zyskiem
+            heapq.heappush(queue, (-current_gain, task))
+            continue
+        if max_iterations is not None and moves >= max_iterations:
+            return moves, False
+        current = system.assignment[task]
+        system.perform_reallocation(task, current, int(best_resources[task]))
+        moves += 1
+    return moves, True
@@ -0,0 +1,324 @@
+import pulp
+
+from clourd_resource import CloudResourceAllocation
+from instrumentation import NULL_INSTRUMENTATION, timed_phase
+from sparse import SparseCostMatrix, row_items
+
+
+class OnlineAllocation:
+    """
+    Alokacja zadań do zasobów aktualizowana zdarzeniami (przybycie i odejście zadania, dodanie i wyłączenie zasobu).
+
+    Każde zdarzenie naprawia tylko zadania, których dotyczy: nowe zadanie trafia na najtańszy zasób z wolną
+    pojemnością (jak w SPLR), a zwolnione miejsce na zasobie zajmuje zadanie, które najwięcej na tym zyskuje
+    (jak w GELR), co może wywołać krótki łańcuch takich przeniesień. Bez ograniczeń pojemności każde zadanie
+    stoi na swoim najtańszym zasobie, więc rozwiązanie jest optymalne po każdym zdarzeniu.
+
+    Przy ograniczonych pojemnościach lokalne ruchy mogą się oddalać od optimum. Dryf to wzrost nadwyżki kosztu
+    przypisanych zadań ponad koszt na ich najtańszych zasobach od ostatniej pełnej optymalizacji, odniesiony
+    do dolnego ograniczenia (sumy najmniejszych kosztów wszystkich zadań). Po przekroczeniu drift_threshold alokacja jest
+    optymalizowana od nowa (reoptimize).
+
+    Zadania i zasoby identyfikowane są dowolnymi hashowalnymi kluczami, a koszty przekazywane jako słowniki
+    - brak pary oznacza, że zadania nie można przypisać do zasobu (jak w SparseCostMatrix.from_rows).
+    """
+
+    def __init__(self, drift_threshold=0.05, instrumentation=None):
+        self.drift_threshold = drift_threshold
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+        self.cost_rows = {}  # zadanie -> {zasób: koszt}
+        self.processing_times = {}
+        self.capacities = {}  # aktywny zasób -> maksymalna liczba zadań (None - bez ograniczeń)
+        self.assignment = {}  # zadanie -> zasób (None - brak dopuszczalnego zasobu z wolną pojemnością)
+        self.tasks_on = {}  # zasób -> zbiór przypisanych zadań
+        self._eligible_tasks = {}  # zasób -> zbiór zadań z kosztem na tym zasobie
+        self._best = {}  # zadanie -> (koszt ważony, zasób) najtańszego aktywnego zasobu lub None
+        # Zadania, które nie stoją na swoim najtańszym zasobie (możliwe tylko przy ograniczonych pojemnościach)
+        self._displaced = set()
+        self.total_cost = 0
+        self.lower_bound = 0
+        self._excess = 0  # suma nadwyżek kosztu przypisanych zadań ponad koszt na najtańszym zasobie
+        self._reference_excess = 0
+
+    @classmethod
+    def from_allocation(cls, system, capacities=None, **kwargs):
+        """
+        Tworzy alokację online z CloudResourceAllocation; zadania i zasoby identyfikowane są indeksami.
+        Zadania zachowują obecne przypisanie, nieprzypisane zadania są rozmieszczane.
+        """
+        online = cls(**kwargs)
+        for resource in range(system.num_resources):
+            online.capacities[resource] = capacities[resource] if capacities is not None else None
+            online.tasks_on[resource] = set()
+            online._eligible_tasks[resource] = set()
+        for task in range(system.num_tasks):
+            online._register_task(task, dict(row_items(system.cost_matrix, task)), system.processing_times[task])
+            resource = system.assignment[task]
+            online.assignment[task] = None
+            if resource >= 0:
+                online._move(task, resource)
+            else:
+                online._place(task)
+        online._reference_excess = online._excess
+        return online
+
+    def to_allocation(self):
+        """
+        Zwraca migawkę bieżącego stanu jako CloudResourceAllocation oraz listy identyfikatorów zadań i zasobów
+        odpowiadające kolejnym indeksom. Przy niepełnej dopuszczalności macierz kosztów jest rzadka.
+        """
+        tasks = list(self.cost_rows)
+        resources = list(self.capacities)
+        index = {resource: j for j, resource in enumerate(resources)}
+        rows = [{index[r]: cost for r, cost in self.cost_rows[task].items()} for task in tasks]
+        if all(len(row) == len(resources) for row in rows):
+            cost_matrix = [[row[j] for j in range(len(resources))] for row in rows]
+        else:
+            cost_matrix = SparseCostMatrix.from_rows(len(resources), rows)
+        system = CloudResourceAllocation(len(tasks), len(resources), cost_matrix,
+                                         [self.processing_times[task] for task in tasks])
+        system.set_assignment([index[self.assignment[task]] if self.assignment[task] is not None else -1
+                               for task in tasks])
+        return system, tasks, resources
+
+    def drift(self):
+        """
+        Wzrost nadwyżki kosztu od ostatniej pełnej optymalizacji względem dolnego ograniczenia.
+        """
+        if not self.lower_bound:
+            return 0.0
+        return (self._excess - self._reference_excess) / self.lower_bound
+
+    def add_task(self, task, costs, processing_time):
+        """
+        Dodaje zadanie i przypisuje je do najtańszego dopuszczalnego zasobu z wolną pojemnością.
+
+        Parametry:
+        task: Identyfikator zadania.
+        costs (dict): Koszty zadania na zasobach {zasób: koszt}; zasoby spoza słownika są niedopuszczalne.
+        processing_time (float): Czas przetwarzania zadania.
+
+        Zwraca:
+        Zasób, do którego przypisano zadanie (None, jeśli brak wolnego dopuszczalnego zasobu).
+        """
+        if task in self.cost_rows:
+            raise ValueError(f"Zadanie {task!r} już istnieje")
+        self.instrumentation.count('online_events')
+        self._register_task(task, {r: cost for r, cost in costs.items() if r in self.capacities}, processing_time)
+        self.assignment[task] = None
+        self._place(task)
+        self._check_drift()
+        return self.assignment[task]
+
+    def remove_task(self, task):
+        """
+        Usuwa zadanie; zwolnione miejsce zajmuje zadanie, które najwięcej zyskuje na przeniesieniu.
+        """
+        self.instrumentation.count('online_events')
+        resource = self._unassign(task)
+        best = self._best.pop(task)
+        if best is not None:
+            self.lower_bound -= best[0]
+        self._displaced.discard(task)
+        for r in self.cost_rows.pop(task):
+            self._eligible_tasks[r].discard(task)
+        del self.processing_times[task], self.assignment[task]
+        if resource is not None:
+            self._fill(resource)
+        self._check_drift()
+
+    def add_resource(self, resource, costs, capacity=None):
+        """
+        Dodaje zasób i przenosi na niego zadania, dla których jest tańszy od obecnego przypisania,
+        w kolejności największej oszczędności.
+
+        Parametry:
+        resource: Identyfikator zasobu.
+        costs (dict): Koszty zadań na nowym zasobie {zadanie: koszt}; pozostałe zadania nie mogą z niego korzystać.
+        capacity (int | None): Maksymalna liczba zadań na zasobie (None - bez ograniczeń).
+        """
+        if resource in self.capacities:
+            raise ValueError(f"Zasób {resource!r} już istnieje")
+        self.instrumentation.count('online_events')
+        self.capacities[resource] = capacity
+        self.tasks_on[resource] = set()
+        self._eligible_tasks[resource] = set()
+        for task, cost in costs.items():
+            if task not in self.cost_rows:
+                continue
+            self.cost_rows[task][resource] = cost
+            self._eligible_tasks[resource].add(task)
+            weight = self._weight(task, resource)
+            best = self._best[task]
+            if best is None or weight < best[0]:
+                self._set_best(task, (weight, resource))
+                self._update_displaced(task)
+        self._fill(resource)
+        self._check_drift()
+
+    def drain_resource(self, resource):
+        """
+        Wyłącza zasób i przenosi jego zadania na najtańsze pozostałe zasoby z wolną pojemnością.
+        """
+        self.instrumentation.count('online_events')
+        del self.capacities[resource]
+        tasks = list(self.tasks_on[resource])
+        for task in tasks:
+            self._unassign(task)
+        del self.tasks_on[resource]
+        for task in self._eligible_tasks.pop(resource):
+            del self.cost_rows[task][resource]
+            if self._best[task][1] == resource:
+                self._set_best(task, self._cheapest(task))
+            self._update_displaced(task)
+        for task in tasks:
+            self._place(task)
+        self._check_drift()
+
+    @timed_phase('online_reoptimization')
+    def reoptimize(self):
+        """
+        Pełna optymalizacja przydziału minimalizująca koszt całkowity przy pojemnościach zasobów.
+        Bez ograniczeń pojemności lokalne ruchy dają już rozwiązanie optymalne.
+        """
+        self.instrumentation.count('reoptimizations')
+        if self._displaced:
+            pairs = [(task, r) for task, row in self.cost_rows.items() for r in row]
+            model = pulp.LpProblem("Online_Resource_Allocation", pulp.LpMinimize)
+            allocation_vars = pulp.LpVariable.dicts("Allocation", range(len(pairs)), cat='Binary')
+            # Najpierw przypisanie jak największej liczby zadań, potem minimalny koszt
+            penalty = 1 + sum(max(self._weight(task, r) for r in row) for task, row in self.cost_rows.items() if row)
+            model += pulp.lpSum((self._weight(task, r) - penalty) * allocation_vars[k]
+                                for k, (task, r) in enumerate(pairs))
+            by_task = {}
+            by_resource = {}
+            for k, (task, r) in enumerate(pairs):
+                by_task.setdefault(task, []).append(allocation_vars[k])
+                by_resource.setdefault(r, []).append(allocation_vars[k])
+            # Zadanie bez wolnego miejsca może pozostać nieprzypisane, więc ograniczenie jest nierównością
+            for variables in by_task.values():
+                model += pulp.lpSum(variables) <= 1
+            for r, variables in by_resource.items():
+                if self.capacities[r] is not None:
+                    model += pulp.lpSum(variables) <= self.capacities[r]
+            model.solve(pulp.PULP_CBC_CMD(msg=False))
+
+            for task in self.cost_rows:
+                self._unassign(task)
+            for k, (task, r) in enumerate(pairs):
+                if (allocation_vars[k].varValue or 0) > 0.5:
+                    self._move(task, r)
+        self._reference_excess = self._excess
+
+    def _weight(self, task, resource):
+        # Koszt ważony czasem przetwarzania, jak w calculate_single_task_cost
+        return self.processing_times[task] * self.cost_rows[task][resource]
+
+    def _register_task(self, task, costs, processing_time):
+        self.cost_rows[task] = costs
+        self.processing_times[task] = processing_time
+        for r in costs:
+            self._eligible_tasks[r].add(task)
+        self._best[task] = None
+        self._set_best(task, self._cheapest(task))
+
+    def _cheapest(self, task, free_only=False):
+        """
+        Najtańszy (koszt ważony, zasób) zadania wśród aktywnych zasobów, opcjonalnie tylko z wolną pojemnością.
+        """
+        best = None
+        for r in self.cost_rows[task]:
+            if free_only and not self._has_room(r):
+                continue
+            weight = self._weight(task, r)
+            if best is None or weight < best[0]:
+                best = (weight, r)
+        return best
+
+    def _set_best(self, task, best):
+        old = self._best[task]
+        change = (best[0] if best is not None else 0) - (old[0] if old is not None else 0)
+        self.lower_bound += change
+        if self.assignment.get(task) is not None:
+            self._excess -= change
+        self._best[task] = best
+
+    def _has_room(self, resource):
+        capacity = self.capacities[resource]
+        return capacity is None or len(self.tasks_on[resource]) < capacity
+
+    def _update_displaced(self, task):
+        resource = self.assignment[task]
+        best = self._best[task]
+        if best is not None and (resource is None or self._weight(task, resource) > best[0]):
+            self._displaced.add(task)
+        else:
+            self._displaced.discard(task)
+
+    def _move(self, task, resource):
+        """
+        Przenosi zadanie na zasób resource; zwraca zasób, który zwolnił (lub None).
+        """
+        self.instrumentation.count('reallocations')
+        old = self._unassign(task)
+        self.assignment[task] = resource
+        self.tasks_on[resource].add(task)
+        self.total_cost += self._weight(task, resource)
+        self._excess += self._weight(task, resource) - self._best[task][0]
+        self._update_displaced(task)
+        return old
+
+    def _unassign(self, task):
+        resource = self.assignment[task]
+        if resource is not None:
+            self.tasks_on[resource].discard(task)
+            self.total_cost -= self._weight(task, resource)
+            self._excess -= self._weight(task, resource) - self._best[task][0]
+            self.assignment[task] = None
+            self._update_displaced(task)
+        return resource
+
+    def _place(self, task):
+        best = self._cheapest(task, free_only=True)
+        if best is not None:
+            self._move(task, best[1])
+        else:
+            self._update_displaced(task)
+
+    def _fill(self, resource):
+        """
+        Zajmuje wolne miejsca na zasobie zadaniami o największej oszczędności; zasób zwolniony przez
+        przeniesione zadanie jest uzupełniany w ten sam sposób (łańcuch przeniesień o malejącym koszcie).
+        """
+        pending = [resource]
+        while pending:
+            resource = pending.pop()
+            if resource in self.capacities and self.capacities[resource] is None:
+                # Bez ograniczenia pojemności przenoszone są od razu wszystkie zadania, które zyskują
+                for task in list(self._displaced & self._eligible_tasks[resource]):
+                    current = self.assignment[task]
+                    if current is None or self._weight(task, resource) < self._weight(task, current):
+                        old = self._move(task, resource)
+                        if old is not None:
+                            pending.append(old)
+                continue
+            while resource in self.capacities and self._has_room(resource):
+                candidate = None
+                for task in self._displaced & self._eligible_tasks[resource]:
+                    current = self.assignment[task]
+                    if current == resource:
+                        continue
+                    # Nieprzypisane zadanie zawsze zyskuje na przypisaniu
+                    saving = (self._weight(task, current) if current is not None else float('inf')) \
+                        - self._weight(task, resource)
+                    if saving > 0 and (candidate is None or saving > candidate[0]):
+                        candidate = (saving, task)
+                if candidate is None:
+                    break
+                old = self._move(candidate[1], resource)
+                if old is not None:
+                    pending.append(old)
+
+    def _check_drift(self):
+        if self.drift() > self.drift_threshold:
+            self.reoptimize()
@@ -0,0 +1,61 @@
+import json
+import sys
+
+_plt = None
+
+
+def _pyplot():
+    """
+    Importuje matplotlib przy pierwszym użyciu i ustawia bezokienkowy backend Agg.
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib import pyplot
+        _plt = pyplot
+    return _plt
+
+
+def plot_initialization_methods(random_costs, initial_costs, filename='PorównanieMetodInicjalizacji.jpg'):
+    plt = _pyplot()
+    plt.figure()
+    plt.boxplot([random_costs, initial_costs], labels=['Losowa', 'Początkowa'])
+    plt.ylabel('Koszt')
+    plt.title('Porównanie Metod Inicjalizacji')
+    plt.savefig(filename)
+    plt.close()
+
+
+def plot_brute_force_performance(optimized_costs, brute_force_costs, filename='PorównanieWydajnościBruteForce.jpg'):
+    plt = _pyplot()
+    plt.figure()
+    plt.boxplot([optimized_costs, brute_force_costs], labels=['Optymalizowane', 'Brute Force'])
+    plt.ylabel('Koszt')
+    plt.title('Porównanie Wydajności Brute Force')
+    plt.savefig(filename)
+    plt.close()
+
+
+def render_reports(results):
+    """
+    Generuje wszystkie wykresy jednym przebiegiem z surowych wyników etapu obliczeń.
+
+    Parametry:
+    results (dict): Surowe wyniki z kluczami 'initialization_methods' i 'brute_force_performance'
+                    (listy kosztów zwracane przez compare_initialization_methods i compare_brute_force_performance).
+                    Brakujące klucze są pomijane.
+    """
+    if 'initialization_methods' in results:
+        plot_initialization_methods(*results['initialization_methods'])
+    if 'brute_force_performance' in results:
+        plot_brute_force_performance(*results['brute_force_performance'])
+
+
+def render_reports_from_file(filename):
+    with open(filename, encoding='utf-8') as file:
+        render_reports(json.load(file))
+
+
+if __name__ == '__main__':
+    render_reports_from_file(sys.argv[1] if len(sys.argv) > 1 else 'wyniki_surowe.json')
@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from clourd_resource import CloudResourceAllocation
+from solvers import hungarian
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('cheapest', 'hungarian', 'pipeline')
+# Największa długość wiersza żądania (bajty)
+LINE_LIMIT = 64 * 1024 * 1024
+
+
+def _solve_pipeline(cost_matrix, processing_times, time_limit):
+    num_tasks, num_resources = len(cost_matrix), len(cost_matrix[0]) if cost_matrix else 0
+    system = CloudResourceAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+    system.initial_optimization()
+    system.minimize_splr()
+    system.minimize_gelr()
+    system.evolutionary_optimization(time_limit=time_limit)
+    return list(system.assignment), system.calculate_total_cost()
+
+
+def solve_batch(requests):
+    """
+    Rozwiązuje mikro-partię żądań w procesie roboczym.
+
+    Parametry:
+    requests (list[dict]): Żądania z polami cost_matrix, processing_times, method i time_limit
+                           (pozostały czas do terminu w sekundach lub None).
+
+    Zwraca:
+    list[dict]: Dla każdego żądania assignment i total_cost albo error z opisem błędu.
+    """
+    results = [None] * len(requests)
+    # Żądania 'cheapest' o tym samym rozmiarze są stosowane w jeden tensor i rozwiązywane jednym argmin
+    groups = {}
+    for index, request in enumerate(requests):
+        try:
+            if request['method'] == 'cheapest':
+                costs = np.asarray(request['cost_matrix'], dtype=float)
+                times = np.asarray(request['processing_times'], dtype=float)
+                # Niepoprawne żądanie nie może trafić do grupy, bo błąd wektorowego przebiegu dotyczy całej grupy
+                if costs.ndim != 2 or times.shape != (costs.shape[0],):
+                    raise ValueError("Długość processing_times musi być równa liczbie wierszy cost_matrix")
+                groups.setdefault(costs.shape, []).append((index, costs, times))
+            elif request['method'] == 'hungarian':
+                weights = (np.asarray(request['cost_matrix'], dtype=float)
+                           * np.asarray(request['processing_times'], dtype=float)[:, None])
+                assignment = hungarian(weights)
+                results[index] = {'assignment': assignment,
+                                  'total_cost': float(sum(weights[i, j] for i, j in enumerate(assignment)))}
+            else:
+                assignment, total_cost = _solve_pipeline(request['cost_matrix'], request['processing_times'],
+                                                         request['time_limit'])
+                results[index] = {'assignment': assignment, 'total_cost': float(total_cost)}
+        except Exception as error:
+            results[index] = {'error': f"{type(error).__name__}: {error}"}
+
+    for members in groups.values():
+        indices = [index for index, _, _ in members]
+        try:
+            weights = (np.stack([costs for _, costs, _ in members])
+                       * np.stack([times for _, _, times in members])[:, :, None])
+            assignments = np.argmin(weights, axis=2)
+            totals = np.take_along_axis(weights, assignments[:, :, None], axis=2)[:, :, 0].sum(axis=1)
+            for k, index in enumerate(indices):
+                results[index] = {'assignment': assignments[k].tolist(), 'total_cost': float(totals[k])}
+        except Exception as error:
+            for index in indices:
+                results[index] = {'error': f"{type(error).__name__}: {error}"}
+    return results
+
+
+def _warm_up():
+    # Pierwsze wywołanie w procesie roboczym ładuje moduły i inicjalizuje NumPy przed nadejściem żądań
+    solve_batch([{'cost_matrix': [[1.0]], 'processing_times': [1.0], 'method': 'cheapest', 'time_limit': None}])
+
+
+class AllocationService:
+    """
+    Serwer asyncio przyjmujący żądania alokacji i rozwiązujący je w mikro-partiach w puli procesów.
+
+    Każde żądanie i odpowiedź to jeden wiersz JSON. Żądanie zawiera pola: id (dowolny identyfikator odsyłany
+    w odpowiedzi), cost_matrix (lista list), processing_times (lista), method ('cheapest' - najtańszy zasób
+    każdego zadania, 'hungarian' - metoda węgierska, 'pipeline' - optymalizacja początkowa, SPLR, GELR
+    i optymalizacja ewolucyjna; domyślnie 'pipeline') oraz opcjonalnie deadline (czas w sekundach od przyjęcia
+    żądania). Odpowiedź zawiera id, status ('ok', 'deadline', 'error'), a przy statusie 'ok' assignment
+    i total_cost.
+
+    Współbieżne żądania są zbierane w mikro-partie (do batch_size żądań lub przez batch_window sekund).
+    Kolejka żądań ma ograniczoną długość - gdy jest pełna, serwer przestaje czytać kolejne żądania z połączeń
+    (przeciwciśnienie), a żądania, których termin minął, nie są rozwiązywane.
+
+    Parametry:
+    workers (int | None): Liczba procesów roboczych (domyślnie os.cpu_count()).
+    batch_size (int): Największa liczba żądań w mikro-partii.
+    batch_window (float): Czas (s) oczekiwania na kolejne żądania po pierwszym żądaniu partii.
+    max_pending (int): Największa liczba żądań oczekujących w kolejce.
+    default_deadline (float | None): Termin (s) dla żądań bez pola deadline.
+    """
+
+    def __init__(self, workers=None, batch_size=32, batch_window=0.005, max_pending=256, default_deadline=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self.default_deadline = default_deadline
+        self._queue = None
+        self._executor = None
+        self._batcher = None
+        self._in_flight = None
+        self._server = None
+        # Referencje do rozwiązywanych mikro-partii - samo create_task nie chroni zadania przed usunięciem
+        self._batches = set()
+        # Wyniki żądań przyjętych, a jeszcze nierozwiązanych (w kolejce, w zbieranej partii lub w puli procesów)
+        self._pending = set()
+        self._closing = False
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """
+        Uruchamia pulę procesów i serwer na gnieździe Unix (path) lub TCP (host, port).
+        """
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._in_flight = asyncio.Semaphore(self.workers)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port, limit=LINE_LIMIT)
+        logger.info("Usługa alokacji nasłuchuje na %s", path or f"{host}:{port}")
+        return self._server
+
+    async def close(self):
+        """
+        Zamyka serwer. Żądania przyjęte, a jeszcze nierozwiązane, dostają odpowiedź z błędem - anulowanie
+        pracy w puli procesów i usunięcie kolejki pozostawiłoby je bez odpowiedzi, a ich połączenia otwarte.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for future in list(self._pending):
+            if not future.done():
+                future.set_result({'error': "Usługa została zamknięta"})
+        if self._queue is not None:
+            # Zwolnienie miejsca w kolejce budzi żądania czekające na umieszczenie w niej
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._executor is not None:
+            # Oczekiwanie na procesy robocze blokowałoby pętlę zdarzeń
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, path=None):
+        server = await self.start(host, port, path)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        requests = set()
+
+        async def respond(response):
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await respond({'id': None, 'status': 'error', 'error': "Żądanie przekracza LINE_LIMIT bajtów"})
+                    break
+                if not line:
+                    break
+                # Odczyt kolejnego wiersza czeka, aż żądanie trafi do kolejki - przeciwciśnienie dla klienta
+                task = await self._submit(line, respond)
+                if task is not None:
+                    requests.add(task)
+                    task.add_done_callback(requests.discard)
+            if requests:
+                await asyncio.gather(*requests, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def _submit(self, line, respond):
+        """
+        Dekoduje żądanie i umieszcza je w kolejce; zwraca zadanie asyncio wysyłające odpowiedź.
+        """
+        request = None
+        try:
+            request = json.loads(line)
+            method = request.get('method', 'pipeline')
+            if method not in METHODS:
+                raise ValueError(f"Nieznana metoda: {method}")
+            payload = {'cost_matrix': request['cost_matrix'], 'processing_times': request['processing_times'],
+                       'method': method}
+            deadline = request.get('deadline', self.default_deadline)
+            if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                         or not deadline >= 0):
+                raise ValueError(f"Termin musi być nieujemną liczbą sekund: {deadline!r}")
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            request_id = request.get('id') if isinstance(request, dict) else None
+            await respond({'id': request_id, 'status': 'error', 'error': f"Niepoprawne żądanie: {error}"})
+            return None
+
+        if self._closing:
+            await respond({'id': request.get('id'), 'status': 'error', 'error': "Usługa została zamknięta"})
+            return None
+        expires = time.monotonic() + deadline if deadline is not None else None
+        future = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        try:
+            await asyncio.wait_for(self._queue.put((payload, expires, future)), timeout=deadline)
+        except asyncio.TimeoutError:
+            self._pending.discard(future)
+            await respond({'id': request.get('id'), 'status': 'deadline'})
+            return None
+        return asyncio.create_task(self._reply(request.get('id'), future, expires, respond))
+
+    async def _reply(self, request_id, future, expires, respond):
+        try:
+            timeout = max(0.0, expires - time.monotonic()) if expires is not None else None
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            await respond({'id': request_id, 'status': 'deadline'})
+            return
+        if 'error' in result:
+            await respond({'id': request_id, 'status': 'error', 'error': result['error']})
+        else:
+            await respond({'id': request_id, 'status': 'ok', **result})
+
+    async def _run_batches(self):
+        """
+        Zbiera żądania z kolejki w mikro-partie i przekazuje je do puli procesów.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            window_end = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = window_end - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Żądania po terminie (odpowiedź 'deadline' została już wysłana) nie są rozwiązywane
+            now = time.monotonic()
+            batch = [(payload, expires, future) for payload, expires, future in batch
+                     if not future.done() and (expires is None or expires > now)]
+            if not batch:
+                continue
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._solve(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _solve(self, batch):
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        payloads = [dict(payload, time_limit=max(0.0, expires - now) if expires is not None else None)
+                    for payload, expires, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, solve_batch, payloads)
+        except Exception as error:
+            logger.exception("Błąd rozwiązywania mikro-partii")
+            results = [{'error': f"{type(error).__name__}: {error}"}] * len(batch)
+        finally:
+            self._in_flight.release()
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def send_request(request, host='127.0.0.1', port=8765, path=None):
+    """
+    Wysyła jedno żądanie do usługi i zwraca odpowiedź (słownik).
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+    try:
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Usługa alokacji zadań do zasobów")
+    parser.add_argument('--host', default='127.0.0.1', help="Adres nasłuchiwania TCP")
+    parser.add_argument('--port', type=int, default=8765, help="Port nasłuchiwania TCP")
+    parser.add_argument('--socket', help="Ścieżka gniazda Unix (zamiast TCP)")
+    parser.add_argument('--workers', type=int, help="Liczba procesów roboczych")
+    parser.add_argument('--batch-size', type=int, default=32, help="Największa liczba żądań w mikro-partii")
+    parser.add_argument('--batch-window', type=float, default=0.005, help="Czas zbierania mikro-partii (s)")
+    parser.add_argument('--max-pending', type=int, default=256, help="Największa liczba oczekujących żądań")
+    parser.add_argument('--deadline', type=float, help="Domyślny termin żądania (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    service = AllocationService(args.workers, args.batch_size, args.batch_window, args.max_pending, args.deadline)
+    asyncio.run(service.serve_forever(args.host, args.port, args.socket))
@@ -0,0 +1,181 @@
+import hashlib
+import os
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from instance_format import load_solution, save_solution
+from sparse import SparseCostMatrix
+
+# Wymiary szkicu instancji (bloki zadań x bloki zasobów) - stały rozmiar niezależny od rozmiaru instancji
+SKETCH_SHAPE = (32, 32)
+
+
+def instance_digest(cost_matrix, processing_times):
+    """
+    Skrót treści instancji (macierz kosztów i czasy przetwarzania) niezależny od jej reprezentacji
+    (lista list, tablica NumPy lub numpy.memmap). Macierz rzadka ma skrót zależny od dopuszczalnych par.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        digest.update(b'sparse%d:' % cost_matrix.num_resources)
+        for part in (cost_matrix.indptr, cost_matrix.indices, cost_matrix.data):
+            digest.update(np.ascontiguousarray(part).tobytes())
+    else:
+        costs = np.ascontiguousarray(cost_matrix, dtype=float)
+        digest.update(b'dense%r:' % (costs.shape,))
+        digest.update(costs.tobytes())
+    digest.update(np.ascontiguousarray(processing_times, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def _block_starts(size, count):
+    # Początki co najwyżej count bloków (prawie) równej długości podziału indeksów 0..size-1
+    return np.unique(np.linspace(0, size, min(size, count), endpoint=False).astype(np.int64))
+
+
+def instance_profile(cost_matrix, processing_times):
+    """
+    Zwraca (struktura, szkic): rozmiar instancji (dla macierzy rzadkiej także skrót wzorca dopuszczalnych par)
+    i szkic o stałym rozmiarze SKETCH_SHAPE służący do porównywania bliskich instancji - sumy kosztów ważonych
+    processing_times[i] * cost_matrix[i][j] w blokach zadań x zasobów. Szkic liczony jest bez budowania
+    ważonej kopii macierzy num_tasks x num_resources.
+    """
+    times = np.asarray(processing_times, dtype=float)
+    sketch = np.zeros(SKETCH_SHAPE)
+    if isinstance(cost_matrix, SparseCostMatrix):
+        num_tasks, num_resources = len(cost_matrix), cost_matrix.num_resources
+        pattern = hashlib.blake2b(np.ascontiguousarray(cost_matrix.indptr).tobytes()
+                                  + np.ascontiguousarray(cost_matrix.indices).tobytes(), digest_size=16).hexdigest()
+        structure = (num_tasks, num_resources, pattern)
+        if cost_matrix.nnz:
+            task_starts = _block_starts(num_tasks, SKETCH_SHAPE[0])
+            resource_starts = _block_starts(num_resources, SKETCH_SHAPE[1])
+            rows = np.repeat(np.arange(num_tasks), np.diff(cost_matrix.indptr))
+            cells = ((np.searchsorted(task_starts, rows, side='right') - 1) * SKETCH_SHAPE[1]
+                     + np.searchsorted(resource_starts, cost_matrix.indices, side='right') - 1)
+            sketch = np.bincount(cells, weights=cost_matrix.data * times[rows], minlength=sketch.size)
+        return structure, sketch.ravel()
+    costs = np.asarray(cost_matrix, dtype=float)
+    structure = costs.shape if costs.ndim == 2 else (len(times), 0)
+    if costs.size:
+        task_starts = _block_starts(costs.shape[0], SKETCH_SHAPE[0])
+        resource_starts = _block_starts(costs.shape[1], SKETCH_SHAPE[1])
+        by_resource = np.add.reduceat(costs, resource_starts, axis=1) * times[:, None]
+        sketch[:len(task_starts), :len(resource_starts)] = np.add.reduceat(by_resource, task_starts, axis=0)
+    return structure, sketch.ravel()
+
+
+class SolutionCache:
+    """
+    Pamięć podręczna rozwiązań adresowana treścią instancji.
+
+    Klucz to skrót (instancja, metoda, parametry, ewentualnie przypisanie początkowe). Rozwiązania trzymane są
+    w pamięci z usuwaniem najdawniej używanych (LRU), a przy podanym katalogu także na dysku w formacie
+    instance_format.save_solution, więc przeżywają ponowne uruchomienie procesu.
+
+    Dla instancji bez trafienia nearest zwraca przypisanie z najbliższej zapamiętanej instancji o tym samym
+    rozmiarze, metodzie i parametrach (względna różnica szkiców instance_profile nie większa niż near_tolerance),
+    które może posłużyć jako rozgrzany start. Szkic ma stały rozmiar, więc pamięć zajmowana przez wpis
+    nie zależy od rozmiaru instancji.
+
+    Parametry:
+    maxsize (int): Największa liczba rozwiązań w pamięci.
+    directory (str | None): Katalog warstwy dyskowej (None - tylko pamięć).
+    near_tolerance (float): Największa względna różnica instancji uznawanej za bliską.
+    """
+
+    def __init__(self, maxsize=128, directory=None, near_tolerance=0.1):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.near_tolerance = near_tolerance
+        self._entries = OrderedDict()  # klucz -> (przypisanie, koszt)
+        # (rozmiar, metoda, parametry) -> {klucz: (szkic, jego norma L1)} do wyszukiwania bliskich instancji
+        self._neighbours = {}
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(digest, method, params=None, start=None):
+        """
+        Klucz rozwiązania: skrót instancji (instance_digest), nazwa metody, jej parametry
+        oraz przypisanie początkowe dla metod, których wynik od niego zależy.
+        """
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{digest}:{method}:{sorted((params or {}).items())!r}".encode())
+        if start is not None:
+            key.update(array('i', start).tobytes())
+        return key.hexdigest()
+
+    def get(self, key):
+        """
+        Zwraca (przypisanie, koszt całkowity) dla klucza lub None; trafienie na dysku trafia też do pamięci.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if self.directory is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                assignment, total_cost = load_solution(path)
+                entry = (array('i', assignment.tobytes()), total_cost)
+                self._remember(key, entry)
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, key, assignment, total_cost, weights=None, group=None):
+        """
+        Zapamiętuje rozwiązanie. Przy podanych weights (szkic instance_profile) i group
+        (rozmiar, metoda, parametry) instancja bierze udział w wyszukiwaniu bliskich instancji.
+        """
+        entry = (array('i', assignment), total_cost)
+        self._remember(key, entry)
+        if weights is not None and group is not None:
+            neighbours = self._neighbours.setdefault(group, OrderedDict())
+            neighbours[key] = (weights, float(np.abs(weights).sum()))
+        if self.directory is not None:
+            path = self._path(key)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            save_solution(temporary, entry[0], total_cost)
+            os.replace(temporary, path)  # Atomowa podmiana - czytelnicy nie widzą niedokończonego pliku
+
+    def nearest(self, weights, group):
+        """
+        Przypisanie zapamiętanej instancji najbliższej szkicowi weights w grupie group
+        lub None, jeśli żadna nie mieści się w near_tolerance.
+
+        Przegląd jest liniowy względem liczby zapamiętanych instancji grupy; porównanie szkiców ma stały koszt
+        i jest pomijane dla kandydatów, których normy nie wykluczają: |norma(w) - norma(c)| <= norma(w - c).
+        """
+        norm = float(np.abs(weights).sum())
+        best = None
+        for key, (cached, scale) in self._neighbours.get(group, {}).items():
+            if not scale:
+                continue
+            limit = best[0] if best is not None else self.near_tolerance
+            if abs(norm - scale) / scale > limit:
+                continue
+            difference = np.abs(weights - cached).sum() / scale
+            if difference <= limit and (best is None or difference < best[0]):
+                best = (difference, key)
+        if best is None:
+            return None
+        return self._entries[best[1]][0]
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            for neighbours in self._neighbours.values():
+                neighbours.pop(evicted, None)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.sol")
@@ -0,0 +1,273 @@
+import numpy as np
+
+# Wspólne górne ograniczenie procesów przeszukujących drzewo (ustawiane w _init_shared_bound)
+_shared_bound = None
+
+
+def hungarian(weights):
+    """
+    Rozwiązuje problem przydziału metodą węgierską (najkrótsze ścieżki powiększające z potencjałami).
+
+    Parametry:
+    weights (array-like): Macierz wag o wymiarach num_tasks x num_resources, num_tasks <= num_resources.
+
+    Zwraca:
+    list[int]: Indeks zasobu dla każdego zadania. Każdy zasób otrzymuje co najwyżej jedno zadanie,
+               a suma wag przypisanych par jest minimalna. Złożoność O(n^2 * m).
+    """
+    weights = np.asarray(weights, dtype=float)
+    num_tasks, num_resources = weights.shape
+    if num_tasks > num_resources:
+        raise ValueError("Liczba zadań nie może przekraczać liczby zasobów")
+
+    # Indeksacja od 1 - kolumna 0 pełni rolę wierzchołka pomocniczego
+    u = np.zeros(num_tasks + 1)
+    v = np.zeros(num_resources + 1)
+    match = np.zeros(num_resources + 1, dtype=np.int64)  # match[j] - zadanie (od 1) przypisane do zasobu j
+    way = np.zeros(num_resources + 1, dtype=np.int64)
+
+    for i in range(1, num_tasks + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(num_resources + 1, np.inf)
+        used = np.zeros(num_resources + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used[1:]
+            reduced = weights[i0 - 1] - u[i0] - v[1:]
+            improved = free & (reduced < minv[1:])
+            minv[1:][improved] = reduced[improved]
+            way[1:][improved] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Odwrócenie ścieżki powiększającej
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assignment = [-1] * num_tasks
+    for j in range(1, num_resources + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
+
+
+def branch_and_bound(weights, capacities=None, workers=None, candidates=None, initial=None, target=None):
+    """
+    Dokładny przydział zadań do zasobów minimalizujący sumę wag metodą podziału i ograniczeń.
+
+    Zadania przeglądane są w kolejności malejącego żalu (różnicy między drugą a pierwszą najmniejszą wagą),
+    a częściowe przydziały odcinane są dolnym ograniczeniem równym sumie najmniejszych wag pozostałych zadań
+    na zasobach, które mają jeszcze wolną pojemność.
+
+    Parametry:
+    weights (list[list[float]]): Macierz wag num_tasks x num_resources; przy podanych candidates wiersze mogą być
+                                 dowolnymi odwzorowaniami zasób -> waga (np. słownikami).
+    capacities (list[int] | None): Maksymalna liczba zadań na każdym zasobie (domyślnie bez ograniczeń).
+    workers (int | None): Liczba procesów przeszukujących poddrzewa równolegle (domyślnie jeden proces).
+    candidates (list[list[int]] | None): Dopuszczalne zasoby każdego zadania (domyślnie wszystkie).
+    initial (list[int] | None): Znany przydział (np. z pamięci podręcznej rozwiązań), który - jeśli jest dopuszczalny
+                                i tańszy od rozwiązania zachłannego - służy jako początkowe górne ograniczenie.
+    target (float | None): Koszt uznawany za wystarczający (np. dolne ograniczenie powiększone o dopuszczalną
+                           lukę); przeszukiwanie kończy się, gdy najlepsze rozwiązanie go osiągnie.
+                           Przeszukiwanie jest pomijane także wtedy, gdy rozwiązanie początkowe osiąga
+                           ograniczenie w korzeniu drzewa.
+
+    Zwraca:
+    tuple[list[int], float]: Indeks zasobu dla każdego zadania oraz suma wag rozwiązania.
+    """
+    num_tasks = len(weights)
+    if candidates is None:
+        num_resources = len(weights[0]) if num_tasks else 0
+        candidates = [range(num_resources)] * num_tasks
+    else:
+        num_resources = max((max(resources) + 1 for resources in candidates if len(resources)), default=0)
+    if capacities is None:
+        capacities = [num_tasks] * num_resources
+
+    order = sorted(range(num_tasks), key=lambda i: -_regret([weights[i][r] for r in candidates[i]]))
+    ranked = [sorted(candidates[i], key=lambda r: (weights[i][r], r)) for i in order]
+    problem = (weights, order, ranked)
+
+    best_cost, best = _greedy(problem, capacities)
+    if initial is not None:
+        initial_cost, initial_best = _evaluate(problem, capacities, candidates, initial)
+        if initial_cost < best_cost:
+            best_cost, best = initial_cost, initial_best
+    target = float('-inf') if target is None else target
+    # Rozwiązanie początkowe osiągające ograniczenie w korzeniu drzewa (lub target) nie wymaga przeszukiwania
+    if best_cost > max(target, _lower_bound(problem, 0, capacities)):
+        if workers is None or workers <= 1:
+            best_cost, best = _search(problem, [], 0, list(capacities), best_cost, best, target)
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            prefixes = _expand_prefixes(problem, capacities, best_cost, 4 * workers)
+            shared_bound = multiprocessing.Value('d', best_cost)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_shared_bound,
+                                     initargs=(shared_bound,)) as executor:
+                futures = [executor.submit(_search, problem, prefix, partial_cost, prefix_capacities, best_cost, None,
+                                           target)
+                           for prefix, partial_cost, prefix_capacities in prefixes]
+                for future in futures:
+                    cost, assignment = future.result()
+                    if assignment is not None and cost < best_cost:
+                        best_cost, best = cost, assignment
+
+    if best is None:
+        raise ValueError("Brak dopuszczalnego przydziału dla podanych pojemności zasobów")
+    assignment = [-1] * num_tasks
+    for depth, resource in enumerate(best):
+        assignment[order[depth]] = resource
+    return assignment, best_cost
+
+
+def _init_shared_bound(shared_bound):
+    global _shared_bound
+    _shared_bound = shared_bound
+
+
+def _regret(row):
+    if len(row) < 2:
+        return 0
+    first, second = sorted(row)[:2]
+    return second - first
+
+
+def _lower_bound(problem, depth, capacities):
+    """
+    Suma najmniejszych wag zadań od pozycji depth na zasobach z wolną pojemnością.
+    """
+    weights, order, ranked = problem
+    bound = 0
+    for k in range(depth, len(order)):
+        row = weights[order[k]]
+        for resource in ranked[k]:
+            if capacities[resource] > 0:
+                bound += row[resource]
+                break
+        else:
+            return float('inf')
+    return bound
+
+
+def _greedy(problem, capacities):
+    """
+    Rozwiązanie zachłanne służące jako początkowe górne ograniczenie.
+    """
+    weights, order, ranked = problem
+    capacities = list(capacities)
+    assignment = []
+    cost = 0
+    for k, task in enumerate(order):
+        for resource in ranked[k]:
+            if capacities[resource] > 0:
+                capacities[resource] -= 1
+                assignment.append(resource)
+                cost += weights[task][resource]
+                break
+        else:
+            return float('inf'), None
+    return cost, assignment
+
+
+def _evaluate(problem, capacities, candidates, assignment):
+    """
+    Koszt i przydział w kolejności przeszukiwania dla podanego przydziału (inf, jeśli nie jest dopuszczalny).
+    """
+    weights, order, _ = problem
+    if len(assignment) != len(order):
+        return float('inf'), None
+    capacities = list(capacities)
+    cost = 0
+    for task, resource in enumerate(assignment):
+        if resource not in candidates[task] or capacities[resource] == 0:
+            return float('inf'), None
+        capacities[resource] -= 1
+        cost += weights[task][resource]
+    return cost, [assignment[task] for task in order]
+
+
+def _expand_prefixes(problem, capacities, best_cost, min_count):
+    """
+    Rozwija górne poziomy drzewa przeszukiwania do co najmniej min_count niezależnych poddrzew.
+    """
+    weights, order, ranked = problem
+    prefixes = [([], 0, list(capacities))]
+    depth = 0
+    while len(prefixes) < min_count and depth < len(order):
+        expanded = []
+        task = order[depth]
+        for prefix, partial_cost, prefix_capacities in prefixes:
+            for resource in ranked[depth]:
+                if prefix_capacities[resource] == 0:
+                    continue
+                cost = partial_cost + weights[task][resource]
+                child_capacities = list(prefix_capacities)
+                child_capacities[resource] -= 1
+                if cost + _lower_bound(problem, depth + 1, child_capacities) < best_cost:
+                    expanded.append((prefix + [resource], cost, child_capacities))
+        prefixes = expanded
+        depth += 1
+    # Najpierw poddrzewa o najniższym ograniczeniu - najszybciej dostarczają dobrych rozwiązań
+    prefixes.sort(key=lambda item: item[1] + _lower_bound(problem, len(item[0]), item[2]))
+    return prefixes
+
+
+def _search(problem, prefix, partial_cost, capacities, best_cost, best, target=float('-inf')):
+    """
+    Przeszukiwanie w głąb poddrzewa o ustalonym prefiksie przydziału.
+    Zwraca najlepsze znalezione rozwiązanie tańsze niż best_cost (lub przekazane best);
+    kończy się wcześniej, gdy ograniczenie spadnie do target.
+    W procesie roboczym ograniczenie jest współdzielone z pozostałymi procesami przez _shared_bound.
+    """
+    weights, order, ranked = problem
+    num_tasks = len(order)
+    chosen = list(prefix)
+    found = [best_cost, best]
+    # Ograniczenie do odcinania - może być ostrzejsze niż koszt własnego rozwiązania w found
+    incumbent = [best_cost]
+    shared = _shared_bound.get_obj() if _shared_bound is not None else None
+
+    def visit(depth, cost):
+        if incumbent[0] <= target:
+            return  # Osiągnięto koszt wystarczający
+        if depth == num_tasks:
+            if cost < incumbent[0]:
+                incumbent[0] = cost
+                found[0], found[1] = cost, list(chosen)
+                if shared is not None:
+                    with _shared_bound.get_lock():
+                        if cost < shared.value:
+                            shared.value = cost
+            return
+        if shared is not None and shared.value < incumbent[0]:
+            # Inny proces znalazł lepsze rozwiązanie - zaostrzamy ograniczenie
+            incumbent[0] = shared.value
+        if cost + _lower_bound(problem, depth, capacities) >= incumbent[0]:
+            return
+        row = weights[order[depth]]
+        for resource in ranked[depth]:
+            if capacities[resource] == 0:
+                continue
+            new_cost = cost + row[resource]
+            if new_cost >= incumbent[0]:
+                break  # Zasoby są posortowane rosnąco według wagi
+            capacities[resource] -= 1
+            chosen.append(resource)
+            visit(depth + 1, new_cost)
+            chosen.pop()
+            capacities[resource] += 1
+
+    visit(len(prefix), partial_cost)
+    return found[0], found[1]
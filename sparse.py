@@ -0,0 +1,119 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class SparseCostMatrix:
+    """
+    Macierz kosztów w formacie CSR (indptr / indices / data) przechowująca tylko dopuszczalne pary zadanie-zasób.
+
+    Koszty wiersza i znajdują się w data[indptr[i]:indptr[i + 1]], a odpowiadające im zasoby (posortowane rosnąco)
+    w indices[indptr[i]:indptr[i + 1]]. Odczyt cost_matrix[i][j] dla niedopuszczalnej pary zwraca inf,
+    dzięki czemu macierz może zastąpić gęstą listę list w CloudResourceAllocation.
+    """
+
+    def __init__(self, num_resources, indptr, indices, data):
+        self.num_resources = num_resources
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=float)
+        if len(self.indices) != len(self.data) or self.indptr[-1] != len(self.indices):
+            raise ValueError("Niespójne tablice indptr / indices / data")
+
+    @classmethod
+    def from_dense(cls, cost_matrix, eligibility=None):
+        """
+        Buduje macierz z gęstej macierzy kosztów, zachowując pary, dla których eligibility[i][j] jest prawdą
+        (domyślnie wszystkie pary o skończonym koszcie).
+        """
+        costs = np.asarray(cost_matrix, dtype=float)
+        mask = np.isfinite(costs) if eligibility is None else np.asarray(eligibility, dtype=bool)
+        rows, columns = np.nonzero(mask)
+        indptr = np.zeros(costs.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=costs.shape[0]), out=indptr[1:])
+        return cls(costs.shape[1], indptr, columns, costs[rows, columns])
+
+    @classmethod
+    def from_rows(cls, num_resources, rows):
+        """
+        Buduje macierz z listy wierszy, z których każdy jest słownikiem {zasób: koszt}.
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for row in rows:
+            for resource in sorted(row):
+                indices.append(resource)
+                data.append(row[resource])
+            indptr.append(len(indices))
+        return cls(num_resources, indptr, indices, data)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, task):
+        return SparseRow(self, task)
+
+    def __iter__(self):
+        for task in range(len(self)):
+            yield SparseRow(self, task)
+
+    def __array__(self, dtype=None, copy=None):
+        dense = np.full((len(self), self.num_resources), np.inf)
+        rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense if dtype is None else dense.astype(dtype)
+
+    def eligible_resources(self, task):
+        return self.indices[self.indptr[task]:self.indptr[task + 1]].tolist()
+
+    def row_items(self, task):
+        """
+        Zwraca listę par (zasób, koszt) dopuszczalnych dla zadania task.
+        """
+        start, end = self.indptr[task], self.indptr[task + 1]
+        return list(zip(self.indices[start:end].tolist(), self.data[start:end].tolist()))
+
+
+class SparseRow:
+    """
+    Widok jednego wiersza SparseCostMatrix; row[j] zwraca koszt lub inf dla niedopuszczalnego zasobu.
+    """
+    __slots__ = ('matrix', 'task', 'start', 'end')
+
+    def __init__(self, matrix, task):
+        self.matrix = matrix
+        self.task = task
+        self.start = int(matrix.indptr[task])
+        self.end = int(matrix.indptr[task + 1])
+
+    def __getitem__(self, resource):
+        position = bisect_left(self.matrix.indices, resource, self.start, self.end)
+        if position < self.end and self.matrix.indices[position] == resource:
+            return float(self.matrix.data[position])
+        return float('inf')
+
+    def __len__(self):
+        return self.matrix.num_resources
+
+
+def row_items(cost_matrix, task):
+    """
+    Pary (zasób, koszt) zadania task - tylko dopuszczalne dla macierzy rzadkiej, wszystkie dla gęstej.
+    """
+    if isinstance(cost_matrix, SparseCostMatrix):
+        return cost_matrix.row_items(task)
+    return enumerate(cost_matrix[task])
+
+
+def eligible_resources(cost_matrix, task):
+    """
+    Zasoby dopuszczalne dla zadania task (dla macierzy gęstej wszystkie zasoby).
+    """
+    if isinstance(cost_matrix, SparseCostMatrix):
+        return cost_matrix.eligible_resources(task)
+    return range(len(cost_matrix[task]))
@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from clourd_resource import CloudResourceAllocation
+from generators import generate_cost_matrix, generate_processing_times
+from genetic import genetic_optimization
+from sparse import SparseCostMatrix
+
+
+@pytest.mark.parametrize('rows', [
+    [{0: 3, 2: 5}, {}, {1: 2}],
+    [{0: 3, 2: 5}, {1: 2}, {}],
+    [{}, {}],
+])
+def test_tasks_without_eligible_resources_stay_unassigned(rows):
+    cost_matrix = SparseCostMatrix.from_rows(3, rows)
+    system = CloudResourceAllocation(len(rows), 3, cost_matrix, [1] * len(rows))
+    system.random_initialization()
+    total_cost, _ = genetic_optimization(system, population_size=10, generations=20, mutation_rate=0.5, rng=0)
+
+    for task, row in enumerate(rows):
+        resource = system.assignment[task]
+        assert resource in row if row else resource == -1
+    assert np.isfinite(total_cost)
+    assert total_cost == sum(min(row.values()) for row in rows if row)
+
+
+@pytest.mark.parametrize('seed', [3, 4, 6])
+def test_local_search_never_worsens_the_best_member(seed):
+    random.seed(seed)
+    system = CloudResourceAllocation(8, 4, generate_cost_matrix(8, 4), generate_processing_times(8))
+    system.random_initialization()
+    # minimize_load minimalizuje makespan i pomija pojemności, więc może pogarszać osobniki elity
+    _, history = genetic_optimization(system, population_size=20, generations=50, capacities=[2] * 4,
+                                      local_search='minimize_load', rng=seed)
+
+    assert all(later <= earlier for earlier, later in zip(history, history[1:]))
+
+
+def test_tolerance_stops_once_gap_is_reached():
+    random.seed(0)
+    system = CloudResourceAllocation(6, 3, generate_cost_matrix(6, 3), generate_processing_times(6))
+    system.random_initialization()
+    total_cost, history = genetic_optimization(system, population_size=30, generations=500, rng=0, tolerance=0.0)
+
+    # Bez pojemności dolne ograniczenie (suma najtańszych kosztów zadań) jest kosztem optymalnym
+    assert total_cost == system.lower_bound()
+    assert len(history) < 500
+    assert system.gaps['genetic_optimization'] == 0.0
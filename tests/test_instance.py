@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pytest
+
+from clourd_resource import CloudResourceAllocation
+from generators import generate_cost_matrix, generate_processing_times
+from instance import Instance
+from sparse import SparseCostMatrix
+
+
+def test_cheapest_resources_follow_raw_costs():
+    # Przy zerowym czasie przetwarzania wszystkie koszty ważone są równe, a kolejność zasobów nie
+    cost_matrix, processing_times = [[5, 1, 3]], [0]
+    plain = CloudResourceAllocation(1, 3, cost_matrix, processing_times)
+    shared = CloudResourceAllocation.from_instance(Instance(cost_matrix, processing_times))
+    for system in (plain, shared):
+        system.set_assignment([2])
+
+    assert shared.MinGlobal(0, 2) == plain.MinGlobal(0, 2) == 1
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+@pytest.mark.parametrize('phase', ['minimize_splr', 'minimize_gelr', 'evolutionary_optimization', 'minimize_load'])
+def test_shared_instance_gives_same_results(phase, sparse):
+    random.seed(7)
+    cost_matrix, processing_times = generate_cost_matrix(20, 6), generate_processing_times(20)
+    if sparse:
+        costs = np.array(cost_matrix, dtype=float)
+        costs[np.random.default_rng(7).random(costs.shape) < 0.4] = np.inf
+        costs[:, 0] = 1
+        cost_matrix = SparseCostMatrix.from_dense(costs)
+    instance = Instance(cost_matrix, processing_times)
+    systems = [CloudResourceAllocation(20, 6, cost_matrix, processing_times),
+               CloudResourceAllocation.from_instance(instance)]
+    for system in systems:
+        random.seed(1)
+        system.random_initialization()
+        getattr(system, phase)()
+
+    plain, shared = systems
+    assert list(shared.assignment) == list(plain.assignment)
+    assert shared.calculate_total_cost() == plain.calculate_total_cost()
+    assert shared.calculate_total_utility() == plain.calculate_total_utility()
+    assert shared.calculate_resource_loads() == plain.calculate_resource_loads()
@@ -0,0 +1,56 @@
+import itertools
+import random
+
+import pytest
+
+from clourd_resource import CloudResourceAllocation
+from generators import generate_cost_matrix, generate_processing_times
+from solvers import hungarian
+
+
+class WeightedAllocation(CloudResourceAllocation):
+    """
+    Funkcja celu zależna od zasobu (processing_times[i] * cost_matrix[i][j]), aby porównanie backendów
+    nie sprowadzało się do stałej sumy czasów przetwarzania.
+    """
+    def _objective_coefficient(self, task, resource):
+        return self.processing_times[task] * self.cost_matrix[task][resource]
+
+
+def _instance(num_tasks, num_resources, seed):
+    random.seed(seed)
+    return generate_cost_matrix(num_tasks, num_resources), generate_processing_times(num_tasks)
+
+
+@pytest.mark.parametrize('num_tasks, num_resources', [(1, 1), (3, 3), (5, 5), (2, 4), (4, 7)])
+@pytest.mark.parametrize('seed', range(5))
+def test_hungarian_and_pulp_reach_same_objective(num_tasks, num_resources, seed):
+    cost_matrix, processing_times = _instance(num_tasks, num_resources, seed)
+    objectives = {}
+    for solver in ('hungarian', 'pulp'):
+        system = WeightedAllocation(num_tasks, num_resources, cost_matrix, processing_times)
+        objectives[solver] = system.initial_optimization(solver=solver)
+        # Każde zadanie na innym zasobie
+        assert sorted(set(system.assignment)) == sorted(system.assignment)
+        assert min(system.assignment) >= 0
+    assert objectives['hungarian'] == pytest.approx(objectives['pulp'])
+
+
+@pytest.mark.parametrize('num_tasks, num_resources', [(3, 3), (3, 5)])
+def test_hungarian_matches_exhaustive_search(num_tasks, num_resources):
+    rng = random.Random(num_tasks * 31 + num_resources)
+    for _ in range(20):
+        weights = [[rng.randint(1, 50) for _ in range(num_resources)] for _ in range(num_tasks)]
+        assignment = hungarian(weights)
+        optimum = min(sum(weights[i][j] for i, j in enumerate(resources))
+                      for resources in itertools.permutations(range(num_resources), num_tasks))
+        assert sum(weights[i][j] for i, j in enumerate(assignment)) == optimum
+
+
+def test_hungarian_rejects_more_tasks_than_resources():
+    cost_matrix, processing_times = _instance(4, 3, 0)
+    system = CloudResourceAllocation(4, 3, cost_matrix, processing_times)
+    with pytest.raises(ValueError):
+        system.initial_optimization(solver='hungarian')
+    with pytest.raises(ValueError):
+        hungarian([[1, 2, 3]] * 4)